@@ -1,5 +1,8 @@
+import copy
+
 from .Component import Component
 from .Sprite import Sprite
+from ..scheduler import TimerHandle
 
 
 class Animation:
@@ -28,6 +31,7 @@ class Animator(Component):
     sprite: Sprite
 
     _current_animation: str
+    _handle: TimerHandle | None = None
 
     @property
     def current_animation(self):
@@ -37,7 +41,7 @@ class Animator(Component):
     def current_animation(self, value: str | None):
         if self._current_animation is None and value is not None:
             self._current_animation = value
-            self.game.scheduler.add_dict_generator(self, self.run_animation())
+            self.start_animation()
             return
         self._current_animation = value
         if value is None:
@@ -45,7 +49,8 @@ class Animator(Component):
             return
 
         self.dict_animations[self.current_animation].current_frame = 0
-        self.game.scheduler.change_time_dict_generator(self, 0)
+        if self._handle is not None:
+            self._handle.reschedule(0)
 
     def __init__(self, dict_animations: dict[str, Animation], current_animation: str):
         self.dict_animations: dict[str, Animation] = dict_animations
@@ -53,9 +58,15 @@ class Animator(Component):
         for key in self.dict_animations:
             self.dict_animations[key].animator = self
 
+    def on_clone(self):
+        self.dict_animations = {key: copy.copy(animation) for key, animation in self.dict_animations.items()}
+        for animation in self.dict_animations.values():
+            animation.animator = self
+        self._handle = None
+
     def init(self):
         self.sprite = self.GetComponent(Sprite)
-        self.game.scheduler.add_dict_generator(self, self.run_animation())
+        self.start_animation()
 
     def run_animation(self):
         while True:
@@ -64,5 +75,14 @@ class Animator(Component):
             self.sprite.index = next_index if next_index is not None else self.sprite.index
             yield animation.speed
 
+    def start_animation(self):
+        # Only one run_animation at a time, or both would advance the frames
+        self.stop_animation()
+        self._handle = self.game.scheduler.add_generator(self.run_animation())
+
     def stop_animation(self):
-        self.game.scheduler.remove_dict_generator(self)
+        if self._handle is not None:
+            self._handle.cancel()
+
+    def on_destroy(self):
+        self.stop_animation()
@@ -1,6 +1,8 @@
 import math
+from time import perf_counter
 from typing import Callable
 
+import numpy as np
 import pygame as pg
 
 from .Component import Component, Transform
@@ -10,44 +12,129 @@ from ..Geometry import Vec2
 
 class Drawable(Component):
     cameras: list['Camera']
+    # Radius around the item (local units) that contains the whole drawing, used by the cameras to skip
+    # the drawables outside the view (see `world_bounds`). None: never culled by the camera
+    cull_radius: float | None = None
 
     def __init__(self):
         self.cameras = [Camera.instance()]
 
     def init(self):
-        Camera.instance().to_draw.append(self)
+        for camera in self.cameras:
+            camera.add_drawable(self)
+
+    def on_clone(self):
+        self.cameras = list(self.cameras)
+
+    def on_spawn(self):
+        for camera in self.cameras:
+            camera.add_drawable(self)
+
+    def on_release(self):
+        for camera in self.cameras:
+            camera.remove_drawable(self)
+
+    def world_bounds(self) -> tuple[float, float, float, float] | None:
+        """
+        (left, top, right, bottom) world rectangle containing the whole drawing, None if it can't be culled.
+        """
+        if self.cull_radius is None:
+            return None
+        world = self.world_transform
+        radius = self.cull_radius * world.scale
+        return world.x - radius, world.y - radius, world.x + radius, world.y + radius
+
+    def _watch(self):
+        """
+        Listens to the transforms of the item and its parents, moving any of them moves the drawing.
+        """
+        item = self.item
+        while item is not None:
+            listeners = item.transform.listeners
+            if listeners is None:
+                listeners = item.transform.listeners = {}
+            listeners[self._transform_changed] = None
+            item = item.parent
+
+    def _unwatch(self):
+        item = self.item
+        while item is not None:
+            listeners = item.transform.listeners
+            if listeners:
+                listeners.pop(self._transform_changed, None)
+            item = item.parent
+
+    def _transform_changed(self):
+        for camera in self.cameras:
+            camera._moved.add(self)
+
+    @property
+    def word_position(self) -> Transform:
+        """
+        World transform of the drawable, computed when drawn, so drawables don't need a `loop`.
+        """
+        return self.world_transform
+
+    @property
+    def interpolation_alpha(self) -> float:
+        """
+        Fraction [0, 1) of a fixed step elapsed since the last one, to draw between simulation states.
+        """
+        return self.game.interpolation_alpha
 
     def draw(self, cam_x: float, cam_y: float, scale: float, camera: 'Camera'):
         pass
 
     def on_destroy(self):
         for camera in self.cameras:
-            camera.to_draw.remove(self)
+            camera.remove_drawable(self)
+        self._unwatch()
 
         self.on_destroy = lambda: None
 
     def add_camera(self, camera: 'Camera'):
         if camera not in self.cameras:
-            camera.to_draw.append(self)
+            camera.add_drawable(self)
             self.cameras.append(camera)
 
     def remove_camera(self, camera: 'Camera'):
         if camera in self.cameras:
             self.cameras.remove(camera)
-        if self in camera.to_draw:
-            camera.to_draw.remove(self)
+        camera.remove_drawable(self)
 
     def clear_cameras(self):
         for camera in self.cameras:
-            camera.to_draw.remove(self)
+            camera.remove_drawable(self)
         self.cameras.clear()
 
     def remove_main_camera(self):
         self.remove_camera(Camera.instance())
 
 
+class _DrawOrder(tuple):
+    """
+    The drawables of a camera in draw order, changing it doesn't change the camera.
+    """
+
+    @staticmethod
+    def _read_only(*args, **kwargs):
+        raise TypeError("Camera.to_draw is read only, use Camera.add_drawable and Camera.remove_drawable")
+
+    append = extend = insert = remove = pop = clear = sort = reverse = _read_only
+    __setitem__ = __delitem__ = __iadd__ = _read_only
+
+
 class Camera(Component):
+    """
+    Draws its drawables from the position of its item.
+    Drawables are kept by z, and, unless the game has a TransformStore (culled with NumPy instead),
+    in a uniform grid of `cell_size` world units by their `Drawable.world_bounds`, so only the ones in
+    the cells of the view are drawn. Both are updated when a drawable or a parent moves.
+    `cull_stats` has the counts of the last render.
+    """
     instances: dict[int, 'Camera'] = {}
+    # Drawables spanning more cells than this are never culled, instead of filling the grid
+    max_cells_per_drawable = 64
 
     @staticmethod
     def instance() -> 'Camera':
@@ -62,9 +149,10 @@ class Camera(Component):
         return self._screen if self._screen is not None else self.game.screen
 
     def __init__(self, size: None | tuple[float, float] = None, scale_with: int = 0, screen: pg.Surface = None,
-                 fill_color: tuple[int, int, int, int] | None = None):
+                 fill_color: tuple[int, int, int, int] | None = None, cell_size: float = 256):
         """
         scale_with[0: width, 1: height]
+        cell_size: size in world units of the cells of the culling grid
         This camera will be considered the main camera if it is the first camera to be created
         """
 
@@ -72,7 +160,24 @@ class Camera(Component):
             Camera.instances[Game.current_instance] = self
 
         self.scale_with = scale_with
-        self.to_draw: list[Drawable] = []
+        # Drawables by z (higher z drawn first), each layer keeps the order they were added in
+        self._layers: dict[float, dict[Drawable, None]] = {}
+        self._layer_order: list[float] = []
+        self._layer_of: dict[Drawable, float] = {}
+        # Insertion number of each drawable, orders the drawables of a layer
+        self._sequence: dict[Drawable, int] = {}
+        self._added = 0
+        # Drawables moved since the last render
+        self._moved: set[Drawable] = set()
+
+        self.cell_size = cell_size
+        self._cells: dict[tuple[int, int], dict[Drawable, None]] = {}
+        # (first cell x, first cell y, last cell x, last cell y) of each drawable in the grid
+        self._cell_range: dict[Drawable, tuple[int, int, int, int]] = {}
+        # Drawables always drawn: no bounds or too big for the grid
+        self._unbounded: dict[Drawable, None] = {}
+        self.cull_stats: dict[str, int] = {"drawables": 0, "visible": 0, "culled": 0}
+
         self.debug_draws: list[Callable] = []
         self.word_position = Transform()
         self.size = size
@@ -83,6 +188,19 @@ class Camera(Component):
         if self.size is None:
             self.size = self.screen.get_size()
 
+    def on_clone(self):
+        self._layers = {}
+        self._layer_order = []
+        self._layer_of = {}
+        self._sequence = {}
+        self._moved = set()
+        self._cells = {}
+        self._cell_range = {}
+        self._unbounded = {}
+        self.cull_stats = {"drawables": 0, "visible": 0, "culled": 0}
+        self.debug_draws = []
+        self.word_position = Transform()
+
     def on_destroy(self):
         if Game.current_instance in Camera.instances and Camera.instances[Game.current_instance] == self:
             del Camera.instances[Game.current_instance]
@@ -91,12 +209,170 @@ class Camera(Component):
 
     def loop(self):
         self.word_position = Transform.Global
-        self.to_draw.sort(key=lambda drawable: -drawable.transform.z)
+        if self.game.headless:
+            self.debug_draws.clear()
+            return
+
+        self.render()
+
+    @property
+    def to_draw(self) -> tuple[Drawable, ...]:
+        """
+        The drawables of this camera in draw order, read only: use `add_drawable` and `remove_drawable`.
+        """
+        return _DrawOrder(self._draw_order())
+
+    @to_draw.setter
+    def to_draw(self, value):
+        _DrawOrder._read_only()
+
+    def _draw_order(self) -> list[Drawable]:
+        return [drawable for z in self._layer_order for drawable in self._layers[z]]
+
+    def add_drawable(self, drawable: Drawable):
+        if drawable in self._layer_of:
+            return
+        self._add_to_layer(drawable, drawable.transform.z)
+        drawable._watch()
+        if self.game.transform_store is None:
+            self._index(drawable)
+
+    def remove_drawable(self, drawable: Drawable):
+        z = self._layer_of.pop(drawable, None)
+        if z is None:
+            return
+        self._remove_from_layer(drawable, z)
+        self._moved.discard(drawable)
+        self._unindex(drawable)
+
+    def _add_to_layer(self, drawable: Drawable, z: float):
+        layer = self._layers.get(z)
+        if layer is None:
+            layer = self._layers[z] = {}
+            self._layer_order = sorted(self._layers, reverse=True)
+        layer[drawable] = None
+        self._layer_of[drawable] = z
+        self._sequence[drawable] = self._added
+        self._added += 1
+
+    def _remove_from_layer(self, drawable: Drawable, z: float):
+        del self._sequence[drawable]
+        layer = self._layers[z]
+        del layer[drawable]
+        if not layer:
+            del self._layers[z]
+            self._layer_order.remove(z)
+
+    def _index(self, drawable: Drawable):
+        """
+        Puts the drawable in the cells its world bounds touch, nothing changes if they are the same cells.
+        """
+        bounds = drawable.world_bounds()
+        cell_range = None
+        if bounds is not None:
+            size = self.cell_size
+            cell_range = (math.floor(bounds[0] / size), math.floor(bounds[1] / size),
+                          math.floor(bounds[2] / size), math.floor(bounds[3] / size))
+            cells = (cell_range[2] - cell_range[0] + 1) * (cell_range[3] - cell_range[1] + 1)
+            if cells > Camera.max_cells_per_drawable:
+                cell_range = None
+
+        if cell_range is not None and self._cell_range.get(drawable) == cell_range:
+            return
+        self._unindex(drawable)
+
+        if cell_range is None:
+            self._unbounded[drawable] = None
+            return
+        self._cell_range[drawable] = cell_range
+        for cell_x in range(cell_range[0], cell_range[2] + 1):
+            for cell_y in range(cell_range[1], cell_range[3] + 1):
+                cell = self._cells.get((cell_x, cell_y))
+                if cell is None:
+                    cell = self._cells[(cell_x, cell_y)] = {}
+                cell[drawable] = None
+
+    def _unindex(self, drawable: Drawable):
+        if self._unbounded.pop(drawable, 0) is None:
+            return
+        cell_range = self._cell_range.pop(drawable, None)
+        if cell_range is None:
+            return
+        for cell_x in range(cell_range[0], cell_range[2] + 1):
+            for cell_y in range(cell_range[1], cell_range[3] + 1):
+                cell = self._cells[(cell_x, cell_y)]
+                del cell[drawable]
+                if not cell:
+                    del self._cells[(cell_x, cell_y)]
+
+    def _update_moved(self):
+        """
+        Moves the drawables that moved since the last render to their new layer and cells,
+        the others keep their place.
+        """
+        index = self.game.transform_store is None
+        for drawable in self._moved:
+            old_z = self._layer_of.get(drawable)
+            if old_z is None:
+                continue
+            # The item may have a new parent
+            drawable._watch()
+            z = drawable.transform.z
+            if z != old_z:
+                self._remove_from_layer(drawable, old_z)
+                self._add_to_layer(drawable, z)
+            if index:
+                self._index(drawable)
+        self._moved.clear()
+
+    def _visible(self, scale: float) -> list[Drawable]:
+        """
+        The drawables in the cells of the view and the unbounded ones, in draw order.
+        """
+        size = self.cell_size
+        position = self.word_position
+        half_width = self.screen.get_width() / 2 / scale
+        half_height = self.screen.get_height() / 2 / scale
+        first_x = math.floor((position.x - half_width) / size)
+        first_y = math.floor((position.y - half_height) / size)
+        last_x = math.floor((position.x + half_width) / size)
+        last_y = math.floor((position.y + half_height) / size)
+
+        found = dict(self._unbounded)
+        if (last_x - first_x + 1) * (last_y - first_y + 1) <= len(self._cells):
+            for cell_x in range(first_x, last_x + 1):
+                for cell_y in range(first_y, last_y + 1):
+                    cell = self._cells.get((cell_x, cell_y))
+                    if cell:
+                        found.update(cell)
+        else:
+            # Zoomed out, fewer cells in the grid than in the view
+            for (cell_x, cell_y), cell in self._cells.items():
+                if first_x <= cell_x <= last_x and first_y <= cell_y <= last_y:
+                    found.update(cell)
+
+        total = len(self._layer_of)
+        self.cull_stats["drawables"] = total
+        self.cull_stats["visible"] = len(found)
+        self.cull_stats["culled"] = total - len(found)
+
+        if len(found) * 2 > total:
+            return [drawable for drawable in self._draw_order() if drawable in found]
+        layer_of = self._layer_of
+        sequence = self._sequence
+        return sorted(found, key=lambda drawable: (-layer_of[drawable], sequence[drawable]))
+
+    def render(self):
+        """
+        Draws every drawable of this camera from `Camera.word_position`.
+        """
+        if self._moved:
+            self._update_moved()
 
         # Correct to camera size
         scale = self.scale
 
-        position = Transform.Global
+        position = self.word_position
         cam_x = position.x * scale - self.screen.get_width() / 2
         cam_y = position.y * scale - self.screen.get_height() / 2
 
@@ -104,15 +380,50 @@ class Camera(Component):
             # Clear screen with transparent color
             self._screen.fill(self.fill_color)
 
-        for drawable in self.to_draw:
-            if drawable.enable:
-                drawable.draw(cam_x, cam_y, scale, self)
+        if self.game.transform_store is not None:
+            to_draw = self._cull(self._draw_order(), scale)
+        else:
+            to_draw = self._visible(scale)
+
+        profiler = self.game.profiler
+        if profiler is None:
+            for drawable in to_draw:
+                if drawable.enable:
+                    drawable.draw(cam_x, cam_y, scale, self)
+        else:
+            for drawable in to_draw:
+                if drawable.enable:
+                    start = perf_counter()
+                    drawable.draw(cam_x, cam_y, scale, self)
+                    profiler.add(f"draw:{drawable.__class__.__name__}", perf_counter() - start)
 
         for function in self.debug_draws:
             function(cam_x, cam_y, scale, self)
 
         self.debug_draws.clear()
 
+    def _cull(self, to_draw: list[Drawable], scale: float) -> list[Drawable]:
+        """
+        Drops the drawables whose `cull_radius` is outside the view, using the TransformStore arrays.
+        """
+        culled = [drawable for drawable in to_draw if drawable.cull_radius is not None]
+        if not culled:
+            return to_draw
+
+        store = self.game.transform_store
+        indices = np.fromiter((drawable.transform.index for drawable in culled), np.int64, len(culled))
+        radius = np.fromiter((drawable.cull_radius for drawable in culled), np.float64, len(culled))
+        half_size = Vec2(self.screen.get_width() / 2 / scale, self.screen.get_height() / 2 / scale)
+        visible = store.visible(indices, radius, self.word_position.position, half_size)
+
+        hidden = {culled[index] for index in np.flatnonzero(~visible)}
+        self.cull_stats["drawables"] = len(to_draw)
+        self.cull_stats["visible"] = len(to_draw) - len(hidden)
+        self.cull_stats["culled"] = len(hidden)
+        if not hidden:
+            return to_draw
+        return [drawable for drawable in to_draw if drawable not in hidden]
+
     @staticmethod
     def draw_debug_line(start: Vec2[float], end: Vec2[float], color: pg.Color, width: int = 1):
         def draw(cam_x: float, cam_y: float, scale: float, camera: 'Camera'):
@@ -1,5 +1,8 @@
+import copy
 import traceback
-from typing import Type, Tuple
+from time import perf_counter
+from types import MethodType
+from typing import Type, Tuple, Callable
 import math
 from typing import TYPE_CHECKING
 
@@ -8,96 +11,283 @@ from ..NewGame import NewGame
 
 if TYPE_CHECKING:
     from ..Game import Game
+    from .ItemPool import ItemPool
 
 
 class Item:
     """
     Class that represents an item that can have components and children.
+    Items whose subtree has no component that needs `loop` sleep: `Item.update` skips them entirely.
+    Set `Item.active` to False to skip an item and its children even if they have loops.
     """
+    __slots__ = ("components", "children", "transform", "parent", "game", "destroy_on_load", "_active",
+                 "_lookup_cache", "_loopers", "_subtree_loopers", "_children_cache", "_list_index", "_pending",
+                 "_destroyed", "_pool", "_template", "__weakref__")
+
     transform: 'Transform'
     parent: 'Item | None'
 
     game: 'Game'
 
-    def __init__(self, game: 'Game', parent=None):
+    def __init__(self, game: 'Game', parent=None, template: bool = False):
+        """
+        template: the item only holds components to be copied by a `Prefab`, it is never part of the game.
+        Children of a template are templates too.
+        """
         self.components: dict[Type, Component] = {}
         self.children: set[Item] = set()
-        self.transform = Transform()
         self.parent: 'Item | None' = parent
         self.game = game
+        self._template = template or (parent is not None and parent._template)
+        if game.transform_store is not None and not self._template:
+            self.transform = game.transform_store.create(parent.transform if parent else None)
+        else:
+            self.transform = Transform()
         self.destroy_on_load = True
-        if parent:
-            parent.children.add(self)
+        self._active = True
+        # (registry version, {component type: component found in the children})
+        self._lookup_cache: tuple[int, dict[Type, Component | None]] | None = None
+        # Components to call `loop` on and how many of them are in this subtree
+        self._loopers: tuple[Component, ...] = ()
+        self._subtree_loopers = 0
+        self._children_cache: tuple[Item, ...] | None = None
+        # Position in `game.item_list` of a root item, -1 if it isn't there
+        self._list_index = -1
+        self._destroyed = False
+        # The ItemPool this item goes back to when destroyed
+        self._pool: 'ItemPool | None' = None
+        if self._template:
+            self._pending = False
+            if parent:
+                parent.children.add(self)
+        elif game.deferring:
+            # Created while the tree is updating, joins it when the game flushes its commands
+            self._pending = True
+            game.commands.defer(self._attach)
+        else:
+            self._pending = False
+            self._attach()
+
+    def _attach(self):
+        self._pending = False
+        if self._destroyed:
+            return
+        if self.parent:
+            self.parent.children.add(self)
+            self.parent._children_cache = None
         else:
-            game.item_list.append(self)
+            self.game._add_root(self)
+
+    @property
+    def active(self) -> bool:
+        return self._active
+
+    @active.setter
+    def active(self, value: bool):
+        if value != self._active:
+            self._active = value
+            # The batched components of the subtree join or leave `Game.update_batches`
+            self.game.registry.version += 1
+
+    def in_active_tree(self) -> bool:
+        """
+        False if the item or one of its parents is not active.
+        """
+        item = self
+        while item is not None:
+            if not item._active:
+                return False
+            item = item.parent
+        return True
 
     def CreateChild(self) -> 'Item':
         return Item(self.game, self)
 
     def AddChild(self, item: 'Item') -> None:
+        item._add_subtree_loopers(-item._subtree_loopers, item.parent)
         self.children.add(item)
+        self._children_cache = None
         if item.parent:
             item.parent.children.remove(item)
-        else:
-            self.game.item_list.remove(item)
+            item.parent._children_cache = None
+        elif item._list_index >= 0:
+            self.game._remove_root(item)
         item.parent = self
+        item._add_subtree_loopers(item._subtree_loopers, self)
+        if item.transform.listeners:
+            # Its world transform changed with the new parent
+            item.transform._changed()
+        self.game.registry.version += 1
+        if self.game.transform_store is not None:
+            self.game.transform_store.set_parent(item.transform, self.transform)
 
     def Destroy(self):
-        if self.parent:
-            self.parent.children.remove(self)
-        else:
-            self.game.item_list.remove(self)
+        """
+        Destroys the item, its children and their components, or gives it back to its `ItemPool`.
+        While the game is updating it is applied at the end of the frame, see `CommandBuffer`.
+        """
+        if self._destroyed:
+            return
+        if self.game.deferring:
+            self.game.commands.defer(self.Destroy)
+            return
+        if self._pool is not None:
+            self._pool.release(self)
+            return
+        self._destroyed = True
 
-        for child in list(self.children):
+        if self.parent:
+            # The children of a destroyed item were already counted out with it
+            if not self.parent._destroyed:
+                self._add_subtree_loopers(-self._subtree_loopers, self.parent)
+            self.parent.children.discard(self)
+            self.parent._children_cache = None
+        elif self._list_index >= 0:
+            self.game._remove_root(self)
+
+        for child in tuple(self.children):
             child.Destroy()
 
         for component in list(self.components.keys()):
             self.components[component].on_destroy()
 
+        for component in dict.fromkeys(self.components.values()):
+            self.game.registry.remove(component)
+
+        if self.game.transform_store is not None:
+            self.game.transform_store.release(self.transform)
+
+    @staticmethod
+    def _add_subtree_loopers(delta: int, item: 'Item | None'):
+        while item is not None and delta:
+            item._subtree_loopers += delta
+            item = item.parent
+
+    def refresh_loopers(self):
+        """
+        Rebuilds the components `update` calls `loop` on, after a component was added, removed,
+        or changed its `loop` (like `Collider.debug`).
+        """
+        loopers = tuple(
+            component for cls, component in self.components.items()
+            # Each component is also registered under its base classes
+            if cls is component.__class__ and component.needs_loop()
+        )
+        delta = len(loopers) - len(self._loopers)
+        self._loopers = loopers
+        self._add_subtree_loopers(delta, self)
+
     def update(self):
         if not self.parent:
-            Transform.Global = Transform()
+            Transform.Global = Transform.Origin
         self.transform.SetGlobal()
         current_global = Transform.Global
 
-        for component in list(self.components.keys()):
-            if self.components[component].enable:
-                try:
-                    self.components[component].loop()
-                except (KeyboardInterrupt, SystemExit, NewGame) as e:
-                    raise e
-                except Exception as e:
-                    print(f"Error in {self.components[component]}:\n    {e}")
-                    traceback.print_exc()
-
-        for child in list(self.children):
-            Transform.Global = current_global
-            child.update()
+        profiler = self.game.profiler
+        for component in self._loopers:
+            if not component.enable:
+                continue
+            try:
+                if profiler is None:
+                    component.loop()
+                else:
+                    start = perf_counter()
+                    component.loop()
+                    profiler.add(f"loop:{component.__class__.__name__}", perf_counter() - start)
+            except (KeyboardInterrupt, SystemExit, NewGame) as e:
+                raise e
+            except Exception as e:
+                print(f"Error in {component}:\n    {e}")
+                traceback.print_exc()
+
+        children = self._children_cache
+        if children is None:
+            children = self._children_cache = tuple(self.children)
+        for child in children:
+            # Sleeping subtrees have nothing to loop
+            if child._subtree_loopers and child._active:
+                Transform.Global = current_global
+                child.update()
 
     def AddComponent[T: 'Component'](self, component: T) -> T:
+        """
+        Adds `component` to the item, replacing the one of the same class.
+        While the game is updating, components added to an item already in the tree are only added
+        at the end of the frame (see `CommandBuffer`), items that aren't in the tree yet get them right away.
+        """
+        if self.game.deferring and not self._pending:
+            self.game.commands.defer(self._add_component, component)
+            return component
+        return self._add_component(component)
+
+    def _add_component[T: 'Component'](self, component: T) -> T:
+        if self._destroyed:
+            return component
         cls = component.__class__
+        if self._template:
+            # Templates aren't registered nor initialized, only their copies are
+            component.item = self
+            self.components[cls] = component
+            while cls != Component:
+                cls = cls.__bases__[0]
+                self.components[cls] = component
+            return component
+
+        replaced = self.components.get(cls)
+        if replaced is not None:
+            self.game.registry.remove(replaced)
+        self.game.registry.add(component)
+
+        if cls.batched:
+            self.game.batch_types[cls] = None
+
         self.components[cls] = component
         while cls != Component:
             cls = cls.__bases__[0]
             self.components[cls] = component
 
         component._inicialize_(self)
+        self.refresh_loopers()
         return component
 
     def GetComponent[T: Component](self, component: Type[T]) -> T | None:
+        """
+        The component of type `component` of this item, or else the first one found in its children.
+        Lookups in the children are cached until a component is added or removed or the hierarchy changes.
+        """
         try:
             return self.components[component]
         except KeyError:
-            for child in self.children:
-                resp = child.GetComponent(component)
-                if resp:
-                    return resp
+            pass
+        if not self.children:
             return None
 
+        version = self.game.registry.version
+        cache = self._lookup_cache
+        if cache is not None and cache[0] == version:
+            if component in cache[1]:
+                return cache[1][component]
+        else:
+            cache = self._lookup_cache = (version, {})
+
+        resp = None
+        for child in self.children:
+            resp = child.GetComponent(component)
+            if resp:
+                break
+        cache[1][component] = resp
+        return resp
+
 
 class Component:
     item: Item
     enable: bool = True
+    # True if the class overrides `loop_batch`, set automatically
+    batched: bool = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.batched = cls.loop_batch.__func__ is not Component.loop_batch.__func__
 
     # debug: bool = False  # Debug mode
 
@@ -107,7 +297,16 @@ class Component:
 
     @transform.setter
     def transform(self, value: 'Transform') -> None:
-        self.item.transform = value
+        if self.game.transform_store is not None:
+            # The item keeps its view into the store
+            self.item.transform.copy_from(value)
+        else:
+            # Whoever watched the old transform watches the new one
+            listeners = self.item.transform.listeners
+            self.item.transform = value
+            if listeners:
+                value.listeners = listeners
+                value._changed()
 
     @property
     def game(self) -> 'Game':
@@ -115,7 +314,12 @@ class Component:
 
     def _inicialize_(self, item: Item):
         self.item = item
-        self.game.to_init.append(self.init)
+        self.game.to_init.append(self._run_init)
+
+    def _run_init(self):
+        # Items destroyed before their first frame never initialize
+        if not self.item._destroyed:
+            self.init()
 
     # abstract method
     def init(self):
@@ -125,13 +329,94 @@ class Component:
     def loop(self):
         pass
 
+    def needs_loop(self) -> bool:
+        """
+        If `Item.update` has to call `loop` on this component. False if `loop` isn't overridden
+        (by the class or by an instance attribute) or the class is batched.
+        """
+        if self.batched:
+            return False
+        return "loop" in self.__dict__ or self.__class__.loop is not Component.loop
+
+    @property
+    def world_transform(self) -> 'Transform':
+        """
+        World transform of the item, computed when read (cached until the item or a parent moves).
+        Unlike `Transform.Global` it can be read outside `loop` and on sleeping items.
+        The result is shared, read it but don't change it.
+        """
+        if self.game.transform_store is not None:
+            return self.item.transform.world
+        return self.CalculateGlobalTransform()
+
+    def Clone(self) -> 'Component':
+        """
+        A shallow copy of the component, not added to any item: images, polygons and the other attributes
+        are shared with the original. Methods of the original stored as attributes (like `self.loop = self.x`)
+        are bound to the copy. Override `on_clone` to copy the state that can't be shared.
+        """
+        clone = copy.copy(self)
+        attributes = vars(clone)
+        for name, value in attributes.items():
+            if isinstance(value, MethodType) and value.__self__ is self:
+                attributes[name] = MethodType(value.__func__, clone)
+        clone.on_clone()
+        return clone
+
+    # abstract method
+    def on_clone(self):
+        """
+        Called on the copy made by `Clone`, copy here the mutable state (lists, vectors...) the copy
+        must not share with the original.
+        """
+        pass
+
+    @classmethod
+    def loop_batch(cls, components: list['Component']):
+        """
+        Opt-in replacement of `loop` that updates all the enabled components of this class at once,
+        e.g. over NumPy arrays. Once a class overrides it, `Item.update` stops calling `loop` on its
+        components and the game calls this once per frame, before the items update.
+        Subclasses are batched on their own: `components` are exactly of class `cls`.
+        """
+        for component in components:
+            component.loop()
+
     def Destroy(self):
+        """
+        Removes the component from its item.
+        While the game is updating it is applied at the end of the frame, see `CommandBuffer`.
+        """
+        if self.game.deferring:
+            self.game.commands.defer(self.Destroy)
+            return
+        # Already destroyed, by itself or with its item
+        if self.item._destroyed or self.item.components.get(self.__class__) is not self:
+            return
+
         self.on_destroy()
+        self.game.registry.remove(self)
         self.item.components.pop(self.__class__)
         cls = self.__class__
         while cls != Component:
             cls = cls.__bases__[0]
             self.item.components.pop(cls)
+        self.item.refresh_loopers()
+
+    # abstract method
+    def on_spawn(self):
+        """
+        Called when an `ItemPool` hands out the item again, undo here what `on_release` did.
+        """
+        pass
+
+    # abstract method
+    def on_release(self):
+        """
+        Called when the item goes back to its `ItemPool` instead of being destroyed. The component is
+        disabled meanwhile, unregister it here from anything that would still see it (like `Collider.colliders`).
+        """
+        pass
 
     # abstract method
     def on_destroy(self):
@@ -149,18 +434,22 @@ class Component:
     def CalculateGlobalTransform(self) -> 'Transform':
         """
         Calculate the global transform of the item.
-        Expensive operation.
+        Walks the parents, only the transforms that changed are recomputed.
         Use Transform.Global on `Component.loop` instead.
+        The result is shared, read it but don't change it.
         """
-        result = Transform()
+        if self.game.transform_store is not None:
+            return self.game.transform_store.world_of(self.item.transform.index)
+
         parents: list[Item] = []
         current = self.item
         while current:
             parents.append(current)
             current = current.parent
 
+        result = Transform.Origin
         for i in range(len(parents) - 1, -1, -1):
-            result = parents[i].transform.ToGlobal(result)
+            result = parents[i].transform.World(result)
 
         return result
 
@@ -168,12 +457,56 @@ class Component:
 class Transform:
     """
     Class that represents a transform with position, rotation and scale.
+    Every change bumps `Transform.version`, so the world transform of an item is only
+    recomputed when its own transform or an ancestor's world transform changed.
     """
+    __slots__ = ("version", "_x", "_y", "_z", "_scale", "_angle", "_cos", "_sin",
+                 "_world", "_world_version", "_world_parent", "_world_parent_version", "listeners")
+
     Global: 'Transform'
+    # Root of every world transform, never change it
+    Origin: 'Transform'
+
+    _x: float
+    _y: float
+    _z: float
+
+    @property
+    def x(self) -> float:
+        return self._x
+
+    @x.setter
+    def x(self, value: float):
+        self._x = value
+        self.version += 1
+        if self.listeners:
+            self._changed()
+
+    @property
+    def y(self) -> float:
+        return self._y
+
+    @y.setter
+    def y(self, value: float):
+        self._y = value
+        self.version += 1
+        if self.listeners:
+            self._changed()
+
+    @property
+    def z(self) -> float:
+        return self._z
+
+    @z.setter
+    def z(self, value: float):
+        self._z = value
+        self.version += 1
+        if self.listeners:
+            self._changed()
 
-    x: float
-    y: float
-    z: float
+    def _changed(self):
+        for listener in self.listeners:
+            listener()
 
     _scale: float
 
@@ -184,8 +517,14 @@ class Transform:
     @scale.setter
     def scale(self, value):
         self._scale = value if value > 0.0001 else 0.0001
+        self.version += 1
+        if self.listeners:
+            self._changed()
 
     _angle: float
+    # cos and sin of the angle, updated with it
+    _cos: float
+    _sin: float
 
     @property
     def angle(self):
@@ -194,6 +533,15 @@ class Transform:
     @angle.setter
     def angle(self, value):
         self._angle = value % (2 * math.pi)
+        if self._angle:
+            self._cos = math.cos(self._angle)
+            self._sin = math.sin(self._angle)
+        else:
+            self._cos = 1.0
+            self._sin = 0.0
+        self.version += 1
+        if self.listeners:
+            self._changed()
 
     @property
     def angle_deg(self):
@@ -205,20 +553,33 @@ class Transform:
 
     @property
     def position(self) -> Vec2[float]:
-        return Vec2(self.x, self.y)
+        return Vec2(self._x, self._y)
 
     @position.setter
     def position(self, value: Vec2[float]):
-        self.x = value.x
-        self.y = value.y
+        self._x = value.x
+        self._y = value.y
+        self.version += 1
+        if self.listeners:
+            self._changed()
 
     def __init__(self, x: float = 0, y: float = 0, z: float = 0, angle: float = 0, scale: float = 1):
-        self.x = x
-        self.y = y
-        self.z = z
+        self.version = 0
+        # Called on every change of this transform (like the Cameras drawing the item and its children),
+        # a dict used as an insertion ordered set
+        self.listeners: dict[Callable[[], None], None] | None = None
+        self._x = x
+        self._y = y
+        self._z = z
         self.angle = angle
         self.scale = scale
 
+        # Cached world transform and what it was computed from
+        self._world: Transform | None = None
+        self._world_version = -1
+        self._world_parent: Transform | None = None
+        self._world_parent_version = -1
+
     def __add__(self, other):
         return Transform(self.x + other.x, self.y + other.y, self.z + other.z, self.angle + other.angle, self.scale)
 
@@ -237,28 +598,47 @@ class Transform:
     def clone(self):
         return Transform(self.x, self.y, self.z, self.angle, self.scale)
 
+    def _compose(self, parent: 'Transform', out: 'Transform') -> 'Transform':
+        """
+        Writes this transform in the space of `parent` into `out`.
+        """
+        # Rotate point by parent angle, then scale it
+        new_x = (self._x * parent._cos - self._y * parent._sin) * parent._scale
+        new_y = (self._x * parent._sin + self._y * parent._cos) * parent._scale
+
+        out._x = new_x + parent._x
+        out._y = new_y + parent._y
+        out._z = self._z + parent._z
+        out._scale = self._scale * parent._scale
+        out.angle = self._angle + parent._angle  # Bumps out.version
+        return out
+
     def ToGlobal(self, global_transform: 'Transform | None' = None) -> 'Transform':
         global_transform = global_transform if global_transform else Transform.Global
-        # Rotate point by Global.angle
-        new_x = self.x * math.cos(global_transform.angle) - self.y * math.sin(global_transform.angle)
-        new_y = self.x * math.sin(global_transform.angle) + self.y * math.cos(global_transform.angle)
+        return self._compose(global_transform, Transform())
 
-        # Scale point
-        new_x *= global_transform.scale
-        new_y *= global_transform.scale
-
-        return Transform(
-            new_x + global_transform.x,
-            new_y + global_transform.y,
-            self.z + global_transform.z,
-            self.angle + global_transform.angle,
-            self.scale * global_transform.scale
-        )
+    def World(self, parent: 'Transform') -> 'Transform':
+        """
+        Cached `ToGlobal(parent)`, recomputed in place only if this transform or `parent` changed.
+        The result is shared, read it but don't change it.
+        """
+        world = self._world
+        if world is not None and self._world_version == self.version \
+                and self._world_parent is parent and self._world_parent_version == parent.version:
+            return world
+
+        if world is None:
+            world = self._world = Transform()
+        self._compose(parent, world)
+        self._world_version = self.version
+        self._world_parent = parent
+        self._world_parent_version = parent.version
+        return world
 
     def apply_transform(self, point: Tuple[float, float]) -> Tuple[float, float]:
         # Rotate point by self.angle
-        new_x = point[0] * math.cos(self.angle) - point[1] * math.sin(self.angle)
-        new_y = point[0] * math.sin(self.angle) + point[1] * math.cos(self.angle)
+        new_x = point[0] * self._cos - point[1] * self._sin
+        new_y = point[0] * self._sin + point[1] * self._cos
 
         # Scale point
         new_x *= self.scale
@@ -267,4 +647,8 @@ class Transform:
         return new_x + self.x, new_y + self.y
 
     def SetGlobal(self):
-        Transform.Global = self.ToGlobal()
+        Transform.Global = self.World(Transform.Global)
+
+
+Transform.Origin = Transform()
+Transform.Global = Transform.Origin
@@ -0,0 +1,68 @@
+from typing import Type, Iterator
+
+from .Component import Component
+
+
+class ComponentRegistry:
+    """
+    Every component of a Game indexed by its class and its base classes (the same classes
+    `Item.AddComponent` registers), so a system can go through all the Colliders or all the Sprites
+    without scanning the item tree: `game.query(Collider)`.
+    """
+
+    def __init__(self):
+        # dicts are used as insertion ordered sets
+        self._by_type: dict[type, dict[Component, None]] = {}
+        self._query_cache: dict[type, tuple[Component, ...]] = {}
+        # Changes every time a component is added or removed, or the hierarchy changes
+        self.version = 0
+
+    @staticmethod
+    def _classes(component: Component) -> Iterator[type]:
+        cls = component.__class__
+        yield cls
+        while cls != Component:
+            cls = cls.__bases__[0]
+            yield cls
+
+    def add(self, component: Component):
+        for cls in self._classes(component):
+            self._by_type.setdefault(cls, {})[component] = None
+            self._query_cache.pop(cls, None)
+        self.version += 1
+
+    def remove(self, component: Component):
+        for cls in self._classes(component):
+            components = self._by_type.get(cls)
+            if components and component in components:
+                del components[component]
+                self._query_cache.pop(cls, None)
+        self.version += 1
+
+    def query[T: Component](self, component_type: Type[T]) -> tuple[T, ...]:
+        """
+        All the components of `component_type` (subclasses included), in the order they were added.
+        The tuple is cached until a component of that type is added or removed.
+        """
+        try:
+            return self._query_cache[component_type]
+        except KeyError:
+            result = self._query_cache[component_type] = tuple(self._by_type.get(component_type, ()))
+            return result
+
+    def first[T: Component](self, component_type: Type[T]) -> T | None:
+        components = self._by_type.get(component_type)
+        return next(iter(components), None) if components else None
+
+    def count(self, component_type: Type[Component]) -> int:
+        components = self._by_type.get(component_type)
+        return len(components) if components else 0
+
+    def __contains__(self, component: Component) -> bool:
+        components = self._by_type.get(component.__class__)
+        return components is not None and component in components
+
+    def clear(self):
+        self._by_type.clear()
+        self._query_cache.clear()
+        self.version += 1
@@ -0,0 +1,159 @@
+from typing import Callable, Iterator, TYPE_CHECKING
+
+from .Component import Component, Item
+
+if TYPE_CHECKING:
+    from ..Game import Game
+
+
+def _initialized():
+    pass
+
+
+class ItemPool:
+    """
+    Reuses root items built by `factory(game)` instead of building a new one on every spawn.
+    Create it with `Game.CreatePool`.
+
+    `Item.Destroy` on an item of the pool gives it back to the pool: it leaves the item tree and the
+    component registry, its components are disabled and get `Component.on_release`, and it waits in
+    the pool with its components, transform and children as they were.
+    `spawn` hands out a waiting item (a hit, its components get `Component.on_spawn`) or builds a new
+    one (a miss), then calls `on_spawn(item, *args)` to set it up.
+    Components `init` only runs once, when the item is built, per spawn setup goes in `on_spawn`.
+    """
+
+    def __init__(self, game: 'Game', factory: Callable[['Game'], Item],
+                 on_spawn: Callable[..., None] | None = None, on_release: Callable[[Item], None] | None = None,
+                 max_size: int | None = None):
+        """
+        on_spawn(item, *args, **kwargs): called with the arguments of `spawn` every time an item is spawned.
+        on_release(item): called every time an item goes back to the pool.
+        max_size: items kept waiting in the pool, the ones released after that are really destroyed.
+        """
+        self.game = game
+        self.factory = factory
+        self.on_spawn = on_spawn
+        self.on_release = on_release
+        self.max_size = max_size
+
+        self._free: list[Item] = []
+        # Components the pool disabled on release, enabled again on spawn
+        self._disabled: dict[Item, list[Component]] = {}
+        self.in_use = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Fraction of the spawns served by a reused item.
+        """
+        spawns = self.hits + self.misses
+        return self.hits / spawns if spawns else 0.0
+
+    def __len__(self):
+        return len(self._free)
+
+    @staticmethod
+    def _components(item: Item) -> Iterator[Component]:
+        # Each component is also registered under its base classes
+        for cls, component in item.components.items():
+            if cls is component.__class__:
+                yield component
+        for child in item.children:
+            yield from ItemPool._components(child)
+
+    def _wake(self, item: Item):
+        for component in self._components(item):
+            self.game.registry.add(component)
+            component.on_spawn()
+        for component in self._disabled.pop(item, ()):
+            component.enable = True
+
+    def _initialize_now(self, item: Item):
+        """
+        Runs the pending `init` of the components of an item built this frame, so `on_release`
+        always undoes a finished setup and `init` doesn't run later on a released component.
+        """
+        to_init = self.game.to_init
+        if not to_init:
+            return
+        components = set(self._components(item))
+        for index, function in enumerate(to_init):
+            if getattr(function, "__self__", None) in components:
+                to_init[index] = _initialized
+                function()
+
+    def spawn(self, *args, **kwargs) -> Item:
+        if self._free:
+            item = self._free.pop()
+            self.hits += 1
+            self._wake(item)
+            if self.game.deferring:
+                item._pending = True
+                self.game.commands.defer(item._attach)
+            else:
+                item._attach()
+        else:
+            item = self.factory(self.game)
+            item._pool = self
+            self.misses += 1
+
+        self.in_use += 1
+        if self.on_spawn is not None:
+            self.on_spawn(item, *args, **kwargs)
+        return item
+
+    def release(self, item: Item):
+        """
+        Gives `item` back to the pool, same as `item.Destroy()`.
+        """
+        if self.game.deferring:
+            self.game.commands.defer(self.release, item)
+            return
+        # Already waiting in the pool
+        if item._list_index < 0 and not item._pending:
+            return
+
+        if self.on_release is not None:
+            self.on_release(item)
+        self.in_use -= 1
+
+        if self.max_size is not None and len(self._free) >= self.max_size:
+            item._pool = None
+            item.Destroy()
+            return
+
+        self._initialize_now(item)
+        self.game._remove_root(item)
+        disabled = []
+        for component in self._components(item):
+            component.on_release()
+            self.game.registry.remove(component)
+            if component.enable:
+                component.enable = False
+                disabled.append(component)
+        self._disabled[item] = disabled
+        self._free.append(item)
+
+    def prewarm(self, count: int):
+        """
+        Builds items until `count` are waiting in the pool, to pay for them on load instead of during play.
+        """
+        for _ in range(count - len(self._free)):
+            item = self.factory(self.game)
+            item._pool = self
+            self.in_use += 1
+            self.release(item)
+
+    def clear(self):
+        """
+        Destroys the items waiting in the pool, the stats are kept.
+        """
+        free, self._free = self._free, []
+        for item in free:
+            item._pool = None
+            # Back to life so Destroy tears them down like any other item
+            self._wake(item)
+            item.Destroy()
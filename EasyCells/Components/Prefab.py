@@ -0,0 +1,64 @@
+from typing import Callable, TYPE_CHECKING
+
+from .Component import Component, Item
+
+if TYPE_CHECKING:
+    from ..Game import Game
+
+
+class Prefab:
+    """
+    An item hierarchy built once, as a template, and copied by `Instantiate`.
+
+    `build(root)` fills the template like a normal item (`AddComponent`, `CreateChild`...), but the template
+    is never part of the game: its components aren't registered nor initialized.
+    `Instantiate` copies every item and its transform, and every component with `Component.Clone`,
+    so images, polygons and everything the constructors computed are shared instead of built again.
+    Attributes of a copy that pointed to a component or item of the template point to its copy,
+    so a component keeping `self.collider = collider` gets the collider of its own copy.
+    Components of the copies are initialized as usual (`init` runs on the next frame).
+    """
+
+    def __init__(self, game: 'Game', build: Callable[[Item], None] | None = None):
+        self.game = game
+        self.root = Item(game, template=True)
+        if build is not None:
+            build(self.root)
+
+    def Instantiate(self, parent: Item | None = None) -> Item:
+        # id of each template item and component -> its copy
+        copies: dict[int, Item | Component] = {}
+        added: list[tuple[Item, Component]] = []
+        item = self._copy(self.root, parent, copies, added)
+
+        for _, component in added:
+            attributes = vars(component)
+            for name, value in attributes.items():
+                replacement = copies.get(id(value))
+                if replacement is not None:
+                    attributes[name] = replacement
+
+        for owner, component in added:
+            owner.AddComponent(component)
+        return item
+
+    def _copy(self, template: Item, parent: Item | None, copies: dict, added: list) -> Item:
+        item = Item(self.game, parent)
+        copies[id(template)] = item
+        if self.game.transform_store is not None:
+            item.transform.copy_from(template.transform)
+        else:
+            item.transform = template.transform.clone()
+        item.destroy_on_load = template.destroy_on_load
+        item.active = template.active
+
+        for cls, component in template.components.items():
+            # Each component is also registered under its base classes
+            if cls is component.__class__:
+                clone = component.Clone()
+                copies[id(component)] = clone
+                added.append((item, clone))
+
+        for child in template.children:
+            self._copy(child, item, copies, added)
+        return item
@@ -2,7 +2,8 @@ import math
 
 from . import Camera
 from .Camera import Drawable
-from .Component import Transform
+from .SpriteSheet import SpriteSheet
+from .SurfaceCache import SurfaceCache
 
 import pygame as pg
 
@@ -38,35 +39,49 @@ def convert_to_grayscale(surface: pg.Surface, strength: float = 1) -> pg.Surface
 
 
 class Sprite(Drawable):
-    image: pg.Surface
-    draw_image: pg.Surface
+    """
+    Draws the frame `index` of its sprite sheet.
+    The sheet of a path is shared by every sprite of that file and frame size (see `SpriteSheet.load`).
+    """
+    sheet: SpriteSheet
     index: int = 0
     size: tuple[int, int] = (0, 0)
+    # Flipped, scaled and rotated frames of every sprite
+    surface_cache = SurfaceCache()
+
+    @property
+    def image(self) -> pg.Surface:
+        return self.sheet.image
 
-    def __init__(self, image_path: str | pg.Surface, size: tuple[int, int] = None):
+    @image.setter
+    def image(self, value: pg.Surface):
+        self.sheet = SpriteSheet(value, self.size if self.size != (0, 0) else None)
+
+    def __init__(self, image_path: str | pg.Surface | SpriteSheet, size: tuple[int, int] = None, index: int = 0):
+        """
+        size: size of the frames of the image, the whole image by default.
+        """
         super().__init__()
-        if isinstance(image_path, pg.Surface):
-            self.image = image_path
+        if isinstance(image_path, SpriteSheet):
+            self.sheet = image_path
+        elif isinstance(image_path, pg.Surface):
+            self.sheet = SpriteSheet(image_path, size)
         else:
-            self.image = pg.image.load(f"Assets/{image_path}").convert_alpha()
-
-        self.size = size if size else self.image.get_size()
+            self.sheet = SpriteSheet.load(image_path, size)
 
-        self.draw_image = pg.Surface(self.size, pg.SRCALPHA)
+        self.index = index
+        self.size = tuple(size) if size else self.sheet.areas[index][2:]
+        self.cull_radius = math.hypot(*self.size) / 2
 
         self.horizontal_flip = False
         self.vertical_flip = False
 
-        self.word_position = Transform()
-
-    def loop(self):
-        self.word_position = Transform.Global
-
     def draw(self, cam_x: float, cam_y: float, scale: float, camera: Camera):
         # Calculate the sprite's position and scaled size
         position = self.word_position * scale
         position.scale *= scale
-        original_size = self.size  # Get original image size
+        area = self.sheet.areas[self.index]
+        original_size = area[2:]  # Get original frame size
         scaled_size = (int(original_size[0] * position.scale), int(original_size[1] * position.scale))
 
         # Calculate the sprite's bounding box on the screen
@@ -82,24 +97,16 @@ class Sprite(Drawable):
         if right < cam_x or left > cam_x + screen_width or bottom < cam_y or top > cam_y + screen_height:
             return  # Skip drawing if out of bounds
 
-        # Crop base_image without losing alpha channel
-        self.draw_image.fill((0, 0, 0, 0))
-        self.draw_image.blit(
-            self.image,
-            (0, 0),
-            (self.index * self.size[0], 0, self.size[0], self.size[1])
+        # Crop, flip, scale and rotate the frame, or reuse it if it was already done
+        image = Sprite.surface_cache.get(
+            self.sheet.image,
+            area,
+            scaled_size,
+            -math.degrees(position.angle),
+            self.horizontal_flip,
+            self.vertical_flip
         )
 
-        # Flip base_image
-        if self.horizontal_flip or self.vertical_flip:
-            self.draw_image = pg.transform.flip(self.draw_image, self.horizontal_flip, self.vertical_flip)
-
-        # Apply nearest neighbor scaling
-        image = pg.transform.scale(self.draw_image, scaled_size)
-
-        # Rotate the image
-        image = pg.transform.rotate(image, -math.degrees(position.angle))
-
         # Draw the image
         size = image.get_size()
         camera.screen.blit(
@@ -136,7 +143,7 @@ class SimpleSprite(Sprite):
 
         # Draw the image
         camera.screen.blit(
-            self.image,
+            self.sheet.frames[self.index],
             (
                 position.x - cam_x - self.size[0] // 2,
                 position.y - cam_y - self.size[1] // 2
@@ -0,0 +1,100 @@
+import pygame as pg
+
+
+class SpriteSheet:
+    """
+    An image cut in frames once, shared by every sprite, animator and tile map renderer using it.
+    `frames[index]` is a subsurface of the image, so frames don't copy pixels nor allocate when drawn.
+    Grid sheets are cut in `frame_size` cells, row by row, use `SpriteSheet.load` to share the sheet of a file.
+    Atlases made by `SpriteSheet.pack` hold many images of any size in one surface, found by name in `names`.
+    """
+    # Images loaded by path
+    images: dict[str, pg.Surface] = {}
+    # Sheets loaded by path, by (path, frame size)
+    sheets: dict[tuple[str, tuple[int, int]], 'SpriteSheet'] = {}
+
+    def __init__(self, image: pg.Surface, frame_size: tuple[int, int] | None = None,
+                 areas: list[tuple[int, int, int, int]] | None = None):
+        """
+        frame_size: size of the cells of the grid, the whole image by default.
+        areas: (x, y, width, height) of each frame, instead of a grid.
+        """
+        self.image = image
+        if areas is None:
+            width, height = image.get_size()
+            frame_size = frame_size if frame_size else (width, height)
+            columns = max(1, width // frame_size[0])
+            rows = max(1, height // frame_size[1])
+            areas = [(x * frame_size[0], y * frame_size[1], *frame_size) for y in range(rows) for x in range(columns)]
+            self.columns = columns
+        else:
+            self.columns = len(areas)
+        self.frame_size = frame_size
+        self.areas: list[tuple[int, int, int, int]] = areas
+        self.names: dict[str, int] = {}
+
+        bounds = image.get_rect()
+        self.frames: list[pg.Surface] = [image.subsurface(bounds.clip(area)) for area in areas]
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __getitem__(self, index: int | str) -> pg.Surface:
+        if isinstance(index, str):
+            index = self.names[index]
+        return self.frames[index]
+
+    def index_of(self, column: int, row: int) -> int:
+        return column + row * self.columns
+
+    @staticmethod
+    def load_image(image_path: str) -> pg.Surface:
+        image = SpriteSheet.images.get(image_path)
+        if image is None:
+            image = SpriteSheet.images[image_path] = pg.image.load(f"Assets/{image_path}").convert_alpha()
+        return image
+
+    @staticmethod
+    def load(image_path: str, frame_size: tuple[int, int] | None = None) -> 'SpriteSheet':
+        """
+        The sheet of a file cut in `frame_size` cells, loaded and cut only the first time.
+        """
+        image = SpriteSheet.load_image(image_path)
+        frame_size = tuple(frame_size) if frame_size else image.get_size()
+        sheet = SpriteSheet.sheets.get((image_path, frame_size))
+        if sheet is None:
+            sheet = SpriteSheet.sheets[(image_path, frame_size)] = SpriteSheet(image, frame_size)
+        return sheet
+
+    @staticmethod
+    def pack(images: dict[str, pg.Surface | str], max_width: int = 1024, padding: int = 1) -> 'SpriteSheet':
+        """
+        Packs many small images (surfaces or paths) in one atlas, in shelves: images go left to right,
+        tallest first, on rows as high as their first image.
+        """
+        surfaces = {
+            name: SpriteSheet.load_image(image) if isinstance(image, str) else image
+            for name, image in images.items()
+        }
+        order = sorted(surfaces, key=lambda name: surfaces[name].get_height(), reverse=True)
+
+        places: dict[str, tuple[int, int, int, int]] = {}
+        x = y = shelf_height = width = 0
+        for name in order:
+            image_width, image_height = surfaces[name].get_size()
+            if x and x + image_width > max_width:
+                y += shelf_height + padding
+                x = shelf_height = 0
+            places[name] = (x, y, image_width, image_height)
+            x += image_width + padding
+            width = max(width, x - padding)
+            shelf_height = max(shelf_height, image_height)
+
+        atlas = pg.Surface((max(width, 1), max(y + shelf_height, 1)), pg.SRCALPHA)
+        for name, area in places.items():
+            atlas.blit(surfaces[name], area[:2])
+
+        names = list(images)
+        sheet = SpriteSheet(atlas, areas=[places[name] for name in names])
+        sheet.names = {name: index for index, name in enumerate(names)}
+        return sheet
@@ -1,40 +1,182 @@
 import math
+from typing import TYPE_CHECKING
 
 import pygame as pg
 from midvoxio.voxio import vox_to_arr
 
 from . import Camera
 from .Camera import Drawable
-from .Component import Transform
+from .SpriteSheet import SpriteSheet
+from ..scheduler import TimerHandle
+
+if TYPE_CHECKING:
+    from ..Game import Game
+
+
+class SpriteStackModel:
+    """
+    The views of a sprite stack (layers side by side in `image`) every `angle` degrees, rendered the first time
+    each one is used and shared by every SpriteStacks of the same image, size, angle and gap (see `acquire`).
+    A model is dropped when the last SpriteStacks using it is destroyed.
+    `warm` renders the missing views a few per frame. `bytes` is the memory used by the rendered views.
+    """
+    models: dict[tuple[pg.Surface, tuple[int, int], float, int], 'SpriteStackModel'] = {}
+
+    def __init__(self, image: pg.Surface, size: tuple[int, int], angle: float, y_gap: int = 3):
+        self.layers = [
+            image.subsurface((x * size[0], 0, size[0], size[1]))
+            for x in range(image.get_width() // size[0])
+        ]
+
+        # Calculate the diagonal size for the rotation bounding box
+        diagonal = math.ceil(math.sqrt(size[0] ** 2 + size[1] ** 2))
+        self.size = (diagonal, diagonal + (len(self.layers) * y_gap))
+        self.angle = angle
+        self.y_gap = y_gap
+
+        self.angles: list[float] = []
+        a = 0.0
+        while a < 360.0:
+            self.angles.append(a)
+            a += angle
+        self.views: list[pg.Surface | None] = [None] * len(self.angles)
+        self.bytes = 0
+
+        self.key = (image, tuple(size), angle, y_gap)
+        # SpriteStacks using the model
+        self.users = 0
+        self._warming: TimerHandle | None = None
+
+    @staticmethod
+    def acquire(image: pg.Surface, size: tuple[int, int], angle: float, y_gap: int = 3) -> 'SpriteStackModel':
+        """
+        The shared model of these parameters, created if needed. Give it back with `release`.
+        """
+        key = (image, tuple(size), angle, y_gap)
+        model = SpriteStackModel.models.get(key)
+        if model is None:
+            model = SpriteStackModel.models[key] = SpriteStackModel(image, size, angle, y_gap)
+        model.users += 1
+        return model
+
+    def release(self):
+        self.users -= 1
+        if self.users > 0:
+            return
+        if self._warming is not None:
+            self._warming.cancel()
+            self._warming = None
+        if SpriteStackModel.models.get(self.key) is self:
+            del SpriteStackModel.models[self.key]
+
+    @staticmethod
+    def total_bytes() -> int:
+        return sum(model.bytes for model in SpriteStackModel.models.values())
+
+    def __len__(self):
+        return len(self.views)
+
+    def view(self, index: int) -> pg.Surface:
+        view = self.views[index]
+        if view is None:
+            view = self.views[index] = self._render(self.angles[index])
+            self.bytes += view.get_width() * view.get_height() * view.get_bytesize()
+        return view
+
+    def view_at(self, angle_deg: float) -> pg.Surface:
+        return self.view(int(angle_deg // self.angle) % len(self.views))
+
+    def _render(self, angle: float) -> pg.Surface:
+        size = self.size
+        layer_r = pg.Surface(size, pg.SRCALPHA)
+        for index, layer in enumerate(self.layers):
+            rotated = pg.transform.rotate(layer, -angle)
+            layer_r.blit(
+                rotated,
+                (
+                    size[0] // 2 - rotated.get_width() // 2,
+                    (size[1] - rotated.get_height() // 2 - size[1] // 2) - (index * self.y_gap) + (len(self.layers) / 2)
+                )
+            )
+        return layer_r
+
+    def render_all(self) -> list[pg.Surface]:
+        return [self.view(index) for index in range(len(self.views))]
+
+    def warm(self, game: 'Game', per_frame: int = 4):
+        """
+        Renders the missing views, `per_frame` views on each frame of `game`, views drawn meanwhile are
+        rendered right away. Pygame surfaces can't be drawn from other threads while the game draws.
+        """
+        if self._warming is not None and self._warming.active:
+            return
+        self._warming = game.scheduler.add_generator(self._warm(per_frame))
+
+    def _warm(self, per_frame: int):
+        for start in range(0, len(self.views), per_frame):
+            for index in range(start, min(start + per_frame, len(self.views))):
+                self.view(index)
+            yield 0
+        self._warming = None
+
+    def clear(self):
+        """
+        Drops the rendered views, they are rendered again when used.
+        """
+        self.views = [None] * len(self.angles)
+        self.bytes = 0
 
 
 class SpriteStacks(Drawable):
+    """
+    Draws the view of its SpriteStackModel for the angle of its item.
+    """
 
     @property
     def size(self) -> tuple[int, int]:
-        return self.images[int(self.transform.angle_deg // self.angle)].get_size()
+        return self.model.size
 
     @property
     def image(self) -> pg.Surface:
-        return self.images[int(self.transform.angle_deg // self.angle)]
+        return self.model.view_at(self.transform.angle_deg)
+
+    @property
+    def images(self) -> list[pg.Surface]:
+        return self.model.render_all()
 
     def image_at(self, angle_deg: float) -> pg.Surface:
-        return self.images[int(angle_deg // self.angle)]
+        return self.model.view_at(angle_deg)
 
-    def __init__(self, image_path: str | pg.Surface, size: tuple[int, int] = None, angle_deg: float = 15.0, y_gap: int = 1):
+    def __init__(self, image_path: str | pg.Surface, size: tuple[int, int] = None, angle_deg: float = 15.0, y_gap: int = 1,
+                 warm: bool = False):
+        """
+        warm: renders every view of the model a few per frame from the first frame, instead of each one
+        when first drawn.
+        """
         super().__init__()
         if isinstance(image_path, pg.Surface):
             image = image_path
         else:
-            image = pg.image.load(f"Assets/{image_path}").convert_alpha()
+            image = SpriteSheet.load_image(image_path)
 
-        self.images = SpriteStacks.spritestacks_from_img(image, size, angle_deg, y_gap)
+        self.model = SpriteStackModel.acquire(image, size, angle_deg, y_gap)
         self.angle = angle_deg
+        self.cull_radius = math.hypot(*self.model.size) / 2
+        self.warm = warm
+
+    def init(self):
+        super().init()
+        if self.warm:
+            self.model.warm(self.game)
 
-        self.word_position = Transform()
+    def on_clone(self):
+        super().on_clone()
+        self.model.users += 1
 
-    def loop(self):
-        self.word_position = Transform.Global
+    def on_destroy(self):
+        super().on_destroy()
+        self.model.release()
+        self.on_destroy = lambda: None
 
     def draw(self, cam_x: float, cam_y: float, scale: float, camera: Camera):
         # Calculate the sprite's position and scaled size
@@ -76,32 +218,14 @@ class SpriteStacks(Drawable):
 
     @staticmethod
     def spritestacks_from_img(image: pg.Surface, size: tuple[int, int], angle: float, y_gap: int = 3) -> list[pg.Surface]:
-        layers_orig = [
-            image.subsurface((x * size[0], 0, size[0], size[1]))
-            for x in range(image.get_width() // size[0])
-        ]
-
-        # Calculate the diagonal size for the rotation bounding box
-        diagonal = math.ceil(math.sqrt(size[0] ** 2 + size[1] ** 2))
-        size = (diagonal, diagonal + (len(layers_orig) * y_gap))
-
-        result: list[pg.Surface] = []
-        a = 0.0
-        while a < 360.0:
-            layer_r = pg.Surface(size, pg.SRCALPHA)
-            for index, layer in enumerate(layers_orig):
-                rotated = pg.transform.rotate(layer, -a)
-                layer_r.blit(
-                    rotated,
-                    (
-                        size[0] // 2 - rotated.get_width() // 2,
-                        (size[1] - rotated.get_height() // 2 - size[1] // 2) - (index * y_gap) + ((len(layers_orig)) / 2)
-                    )
-                )
-            result.append(layer_r)
-            a += angle
-
-        return result
+        """
+        Every view of the sprite stack, rendered now.
+        """
+        model = SpriteStackModel.models.get((image, tuple(size), angle, y_gap))
+        if model is None:
+            # Not kept, nothing would release it
+            model = SpriteStackModel(image, size, angle, y_gap)
+        return model.render_all()
 
     @staticmethod
     def voxel2img(file_path) -> tuple[pg.Surface, tuple[int, int]]:
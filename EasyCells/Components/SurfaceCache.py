@@ -0,0 +1,107 @@
+import weakref
+from collections import OrderedDict
+
+import pygame as pg
+
+
+class SurfaceCache:
+    """
+    Least recently used cache of the frames of images after being flipped, scaled and rotated,
+    shared by every sprite drawing the same image, so identical sprites are transformed once.
+    Angles are rounded to `angle_step` degrees (0: exact angles), scales to whole pixels by the size.
+    Entries are dropped, oldest use first, while the cached surfaces use more than `max_bytes`,
+    and as soon as their image is garbage collected, so images made every frame don't fill the cache.
+    """
+
+    def __init__(self, angle_step: float = 1, max_bytes: int = 64 * 1024 * 1024):
+        self.angle_step = angle_step
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        # Keys hold the id of the image, not the image, so the cache doesn't keep it alive
+        self._surfaces: OrderedDict[tuple, pg.Surface] = OrderedDict()
+        # id of each image -> (weak reference to it, its keys)
+        self._images: dict[int, tuple[weakref.ref, set[tuple]]] = {}
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    @property
+    def hit_rate(self) -> float:
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+    def quantize(self, angle: float) -> float:
+        """
+        Rounds an angle in degrees to the cache step, in [0, 360).
+        """
+        if self.angle_step:
+            angle = round(angle / self.angle_step) * self.angle_step
+        return angle % 360
+
+    def get(self, image: pg.Surface, area: tuple[int, int, int, int], size: tuple[int, int],
+            angle: float = 0, flip_x: bool = False, flip_y: bool = False) -> pg.Surface:
+        """
+        The `area` (x, y, width, height) of `image`, flipped, scaled to `size` and rotated `angle` degrees
+        counterclockwise. The returned surface is shared, don't draw on it.
+        """
+        angle = self.quantize(angle)
+        if not angle and not flip_x and not flip_y and area == (0, 0, *size) and image.get_size() == size:
+            # Nothing to do
+            return image
+        key = (id(image), area, size, angle, flip_x, flip_y)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+
+        if angle:
+            # The unrotated frame is cached too, every angle of a frame starts from it
+            surface = pg.transform.rotate(self.get(image, area, size, 0, flip_x, flip_y), angle)
+        else:
+            # Crop without losing the alpha channel
+            surface = pg.Surface(area[2:], pg.SRCALPHA)
+            surface.blit(image, (0, 0), area)
+            if flip_x or flip_y:
+                surface = pg.transform.flip(surface, flip_x, flip_y)
+            if size != area[2:]:
+                surface = pg.transform.scale(surface, size)
+
+        self._surfaces[key] = surface
+        self.bytes += self._size_of(surface)
+        entry = self._images.get(key[0])
+        if entry is None:
+            # Drops the frames of the image when it's collected, before its id can be reused
+            reference = weakref.ref(image, lambda _, image_id=key[0]: self._forget(image_id))
+            entry = self._images[key[0]] = (reference, set())
+        entry[1].add(key)
+
+        while self.bytes > self.max_bytes and len(self._surfaces) > 1:
+            dropped_key, dropped = self._surfaces.popitem(last=False)
+            self.bytes -= self._size_of(dropped)
+            self._images[dropped_key[0]][1].discard(dropped_key)
+        return surface
+
+    def _forget(self, image_id: int):
+        _, keys = self._images.pop(image_id, (None, ()))
+        for key in keys:
+            self.bytes -= self._size_of(self._surfaces.pop(key))
+
+    def clear(self, image: pg.Surface | None = None):
+        """
+        Drops the cached frames of `image` (after drawing on it), or every frame.
+        """
+        if image is None:
+            self._surfaces.clear()
+            self._images.clear()
+            self.bytes = 0
+            return
+        self._forget(id(image))
+
+    @staticmethod
+    def _size_of(surface: pg.Surface) -> int:
+        width, height = surface.get_size()
+        return width * height * surface.get_bytesize()
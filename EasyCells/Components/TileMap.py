@@ -1,17 +1,147 @@
+import itertools
 import math
+from contextlib import contextmanager
 from typing import Callable
 
+import numpy as np
 import pygame as pg
+from scipy import ndimage
 
 from .Camera import Drawable, Camera
-from .Component import Component, Transform
+from .Component import Component
+from .SpriteSheet import SpriteSheet
+from .SurfaceCache import SurfaceCache
 from ..Geometry import Vec2
 
 
-class TileMap(Component):
+class TileGrid(Component):
+    """
+    Tile storage shared by TileMap and TileMap3D: `matrix` is indexed `matrix[z][y][x]` and may be nested lists
+    or a NumPy array (faster bulk operations, see `load`).
+    Positions and sizes are (x, y[, z]), region values are arrays in the order of the matrix.
+    Bulk operations and `batch` report their changes once to `on_region_change(origin, size)`,
+    not tile by tile to `on_tile_change`.
+    """
+    matrix: list | np.ndarray
 
-    def __init__(self, matrix: list[list[int]]):
+    def __init__(self, matrix: list | np.ndarray):
         self.matrix = matrix
+        self.on_region_change: list[Callable[[tuple[int, ...], tuple[int, ...]], None]] = []
+        # Nested `batch` calls and (first, last) tile changed in the batch
+        self._batches = 0
+        self._dirty: tuple[list[int], list[int]] | None = None
+
+    @staticmethod
+    def load_array(path: str, mmap: bool = False, dtype=np.int32) -> np.ndarray:
+        """
+        Tiles of an `.npy` file, or of a `.csv` file of one row of tiles per line.
+        mmap: maps the `.npy` file instead of reading it, pages are read when used and changes stay in memory.
+        """
+        if path.endswith(".npy"):
+            return np.load(f"Assets/{path}", mmap_mode="c" if mmap else None)
+        return np.loadtxt(f"Assets/{path}", delimiter=",", dtype=dtype, ndmin=2)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = False):
+        return cls(cls.load_array(path, mmap))
+
+    def _slices(self, origin: tuple[int, ...], size: tuple[int, ...]) -> tuple[slice, ...]:
+        return tuple(slice(start, start + length) for start, length in zip(reversed(origin), reversed(size)))
+
+    def _write(self, origin: tuple[int, ...], values: np.ndarray):
+        """
+        Writes `values` at `origin`, row by row when the matrix is made of lists.
+        """
+        slices = self._slices(origin, values.shape[::-1])
+        if isinstance(self.matrix, np.ndarray):
+            self.matrix[slices] = values
+            return
+        last = slices[-1]
+        for index in itertools.product(*(range(part.start, part.stop) for part in slices[:-1])):
+            row = self.matrix
+            for position in index:
+                row = row[position]
+            row[last] = values[tuple(start - part.start for start, part in zip(index, slices))].tolist()
+
+    def set_region(self, origin: tuple[int, ...], values):
+        values = np.asarray(values)
+        self._write(origin, values)
+        self._region_changed(origin, values.shape[::-1])
+
+    def fill(self, origin: tuple[int, ...], size: tuple[int, ...], value: int):
+        if isinstance(self.matrix, np.ndarray):
+            self.matrix[self._slices(origin, size)] = value
+        else:
+            self._write(origin, np.full(size[::-1], value))
+        self._region_changed(origin, size)
+
+    def flood(self, origin: tuple[int, ...], value: int) -> int:
+        """
+        Sets the tiles connected to `origin` (by their sides) with the same value as it to `value`.
+        Returns the number of tiles changed.
+        """
+        array = np.asarray(self.matrix)
+        index = tuple(reversed(origin))
+        target = array[index]
+        if target == value:
+            return 0
+
+        labels, _ = ndimage.label(array == target)
+        region = labels == labels[index]
+        slices = ndimage.find_objects(region.astype(np.int8))[0]
+        region_origin = tuple(int(part.start) for part in reversed(slices))
+        region_size = tuple(int(part.stop - part.start) for part in reversed(slices))
+
+        if isinstance(self.matrix, np.ndarray):
+            self.matrix[region] = value
+        else:
+            part = array[slices].copy()
+            part[region[slices]] = value
+            self._write(region_origin, part)
+        self._region_changed(region_origin, region_size)
+        return int(np.count_nonzero(region))
+
+    @contextmanager
+    def batch(self):
+        """
+        Inside the block, `set_tile` and bulk operations report a single region with every change when it ends.
+        """
+        self._batches += 1
+        try:
+            yield self
+        finally:
+            self._batches -= 1
+            if not self._batches and self._dirty is not None:
+                first, last = self._dirty
+                self._dirty = None
+                self._region_changed(tuple(first), tuple(end - start for start, end in zip(first, last)))
+
+    def _batched(self, position: tuple[int, ...]) -> bool:
+        """
+        Adds a changed tile to the batch, False if there's no batch and the tile listeners must be called.
+        """
+        if not self._batches:
+            return False
+        self._region_changed(position, (1,) * len(position))
+        return True
+
+    def _region_changed(self, origin: tuple[int, ...], size: tuple[int, ...]):
+        if self._batches:
+            end = [start + length for start, length in zip(origin, size)]
+            if self._dirty is None:
+                self._dirty = (list(origin), end)
+            else:
+                first, last = self._dirty
+                self._dirty = ([min(a, b) for a, b in zip(first, origin)], [max(a, b) for a, b in zip(last, end)])
+            return
+        for callback in self.on_region_change:
+            callback(origin, size)
+
+
+class TileMap(TileGrid):
+
+    def __init__(self, matrix: list[list[int]] | np.ndarray):
+        super().__init__(matrix)
         self.size = (len(matrix[0]), len(matrix))
 
         self.on_tile_change: list[Callable[[int, int, int], None]] = []
@@ -21,28 +151,65 @@ class TileMap(Component):
 
     def set_tile(self, x: int, y: int, value: int):
         self.matrix[y][x] = value
+        if self._batched((x, y)):
+            return
         for callback in self.on_tile_change:
             callback(x, y, value)
 
 
 class TileMapRenderer(Drawable):
+    """
+    Draws its item's TileMap baked in chunks of `chunk_size` x `chunk_size` tiles.
+    A chunk is baked the first time it is seen, and only the tiles changed by `TileMap.set_tile` are drawn
+    again after that. Only the chunks in the view are drawn, scaled and rotated ones are kept in
+    `TileMapRenderer.chunk_cache` for each zoom and angle.
+    """
     tile_map: TileMap
+    # Scaled and rotated chunks of every renderer
+    chunk_cache = SurfaceCache(max_bytes=128 * 1024 * 1024)
 
-    def __init__(self, tile_set: str | pg.Surface, tile_size: int):
+    def __init__(self, tile_set: str | pg.Surface | SpriteSheet, tile_size: int, chunk_size: int = 16):
         super().__init__()
-        if isinstance(tile_set, str):
-            self.tile_set = pg.image.load(f"Assets/{tile_set}").convert_alpha()
+        if isinstance(tile_set, SpriteSheet):
+            self.sheet = tile_set
+        elif isinstance(tile_set, str):
+            self.sheet = SpriteSheet.load(tile_set, (tile_size, tile_size))
         else:
-            self.tile_set = tile_set
+            self.sheet = SpriteSheet(tile_set, (tile_size, tile_size))
+        self.tile_set = self.sheet.image
         self.tile_size = tile_size
+        self.chunk_size = chunk_size
 
         size = self.tile_set.get_size()
-        self.word_position = Transform()
         self.matrix_size = (size[0] // tile_size, size[1] // tile_size)
-        Camera.instance().to_draw.append(self)
+
+        self._chunks: dict[tuple[int, int], pg.Surface] = {}
 
     def init(self):
         self.tile_map = self.GetComponent(TileMap)
+        # Before registering, so the cameras know the bounds of the map
+        self.cull_radius = math.hypot(*self.pixel_size) / 2
+        super().init()
+        self.tile_map.on_tile_change.append(self._tile_changed)
+        self.tile_map.on_region_change.append(self._region_changed)
+
+    def on_clone(self):
+        super().on_clone()
+        self._chunks = {}
+
+    def on_destroy(self):
+        super().on_destroy()
+        tile_map = getattr(self, "tile_map", None)
+        if tile_map is not None and self._tile_changed in tile_map.on_tile_change:
+            tile_map.on_tile_change.remove(self._tile_changed)
+            tile_map.on_region_change.remove(self._region_changed)
+        for chunk in self._chunks.values():
+            TileMapRenderer.chunk_cache.clear(chunk)
+        self._chunks.clear()
+
+    @property
+    def pixel_size(self) -> tuple[int, int]:
+        return self.tile_size * self.tile_map.size[0], self.tile_size * self.tile_map.size[1]
 
     def int2coord(self, value: int) -> tuple[int, int]:
         return value % self.matrix_size[0], value // self.matrix_size[0]
@@ -51,7 +218,7 @@ class TileMapRenderer(Drawable):
         return coord[0] + coord[1] * self.matrix_size[0]
 
     def get_tile(self, x: int, y: int) -> pg.Surface:
-        return self.tile_set.subsurface((x * self.tile_size, y * self.tile_size, self.tile_size, self.tile_size))
+        return self.sheet.frames[self.coord2int((x, y))]
 
     def get_tile_word_position(self, x: int, y: int) -> Vec2[float]:
         x_new = self.word_position.x + self.tile_size * (x - self.tile_map.size[0] // 2)
@@ -62,38 +229,106 @@ class TileMapRenderer(Drawable):
 
         return Vec2(x_new, y_new)
 
-    def loop(self):
-        self.word_position = Transform.Global
+    def _tile_changed(self, x: int, y: int, value: int):
+        chunk_position = (x // self.chunk_size, y // self.chunk_size)
+        chunk = self._chunks.get(chunk_position)
+        if chunk is None:
+            # Not baked yet, it will be baked with the new tile
+            return
+        position = (x % self.chunk_size * self.tile_size, y % self.chunk_size * self.tile_size)
+        chunk.fill((0, 0, 0, 0), (*position, self.tile_size, self.tile_size))
+        chunk.blit(self.sheet.frames[value], position)
+        TileMapRenderer.chunk_cache.clear(chunk)
+
+    def _region_changed(self, origin: tuple[int, int], size: tuple[int, int]):
+        # The chunks of the region are baked again when seen
+        first_x, first_y = origin[0] // self.chunk_size, origin[1] // self.chunk_size
+        last_x = (origin[0] + size[0] - 1) // self.chunk_size
+        last_y = (origin[1] + size[1] - 1) // self.chunk_size
+        for chunk_x in range(first_x, last_x + 1):
+            for chunk_y in range(first_y, last_y + 1):
+                chunk = self._chunks.pop((chunk_x, chunk_y), None)
+                if chunk is not None:
+                    TileMapRenderer.chunk_cache.clear(chunk)
+
+    def _bake(self, chunk_x: int, chunk_y: int) -> pg.Surface:
+        first_x, first_y = chunk_x * self.chunk_size, chunk_y * self.chunk_size
+        last_x = min(first_x + self.chunk_size, self.tile_map.size[0])
+        last_y = min(first_y + self.chunk_size, self.tile_map.size[1])
+
+        chunk = pg.Surface(((last_x - first_x) * self.tile_size, (last_y - first_y) * self.tile_size), pg.SRCALPHA)
+        frames = self.sheet.frames
+        matrix = self.tile_map.matrix
+        for y in range(first_y, last_y):
+            row = matrix[y]
+            for x in range(first_x, last_x):
+                chunk.blit(frames[row[x]], ((x - first_x) * self.tile_size, (y - first_y) * self.tile_size))
+
+        self._chunks[(chunk_x, chunk_y)] = chunk
+        return chunk
 
     def draw(self, cam_x: float, cam_y: float, scale: float, camera: Camera):
         position = self.word_position * scale
         position.scale *= scale
 
-        # Create a new surface to draw the tile map
-        image = pg.Surface(
-            (self.tile_size * self.tile_map.size[0], self.tile_size * self.tile_map.size[1]),
-            pg.SRCALPHA
-        )
-
-        # Draw the tile map
-        for y, row in enumerate(self.tile_map.matrix):
-            for x, tile in enumerate(row):
-                image.blit(self.get_tile(*self.int2coord(tile)), (x * self.tile_size, y * self.tile_size))
-
-        # Get size and apply nearest neighbor scaling
-        original_size = image.get_size()
-        new_size = (int(original_size[0] * position.scale), int(original_size[1] * position.scale))
-        image = pg.transform.scale(image, new_size)
-
-        # Rotate base_image
-        image = pg.transform.rotate(image, -math.degrees(position.angle))
-
-        # Draw base_image
-        size = image.get_size()
-        camera.screen.blit(
-            image,
-            (
-                position.x - cam_x - size[0] // 2,
-                position.y - cam_y - size[1] // 2
-            )
-        )
+        map_width, map_height = self.pixel_size
+        chunk_pixels = self.chunk_size * self.tile_size
+        chunks_x = math.ceil(self.tile_map.size[0] / self.chunk_size)
+        chunks_y = math.ceil(self.tile_map.size[1] / self.chunk_size)
+
+        # Same size and place the whole map would have after scaling
+        map_scale = position.scale
+        scaled_width, scaled_height = int(map_width * map_scale), int(map_height * map_scale)
+        center_x, center_y = position.x - cam_x, position.y - cam_y
+        left, top = center_x - scaled_width // 2, center_y - scaled_height // 2
+        screen_width, screen_height = camera.screen.get_size()
+        # Rounded like the cached chunks are rotated, so they are placed for the angle they are drawn at
+        angle = TileMapRenderer.chunk_cache.quantize(-math.degrees(position.angle))
+
+        if angle == 0:
+            # Chunks in the view
+            step = chunk_pixels * map_scale
+            if step <= 0:
+                return
+            first_x = max(0, math.floor(-left / step))
+            first_y = max(0, math.floor(-top / step))
+            last_x = min(chunks_x - 1, math.floor((screen_width - left) / step))
+            last_y = min(chunks_y - 1, math.floor((screen_height - top) / step))
+        else:
+            first_x, first_y, last_x, last_y = 0, 0, chunks_x - 1, chunks_y - 1
+            cos, sin = math.cos(-math.radians(angle)), math.sin(-math.radians(angle))
+            # Radius of a rotated chunk
+            radius = chunk_pixels * map_scale * 0.75
+
+        for chunk_y in range(first_y, last_y + 1):
+            # Edges of the chunk in the scaled map, so neighbour chunks don't leave gaps
+            top_edge = int(chunk_y * chunk_pixels * map_scale)
+            bottom_edge = int(min((chunk_y + 1) * chunk_pixels, map_height) * map_scale)
+            for chunk_x in range(first_x, last_x + 1):
+                left_edge = int(chunk_x * chunk_pixels * map_scale)
+                right_edge = int(min((chunk_x + 1) * chunk_pixels, map_width) * map_scale)
+
+                if angle != 0:
+                    # Center of the chunk turned around the center of the map
+                    offset_x = (left_edge + right_edge) / 2 - scaled_width / 2
+                    offset_y = (top_edge + bottom_edge) / 2 - scaled_height / 2
+                    x = center_x + offset_x * cos - offset_y * sin
+                    y = center_y + offset_x * sin + offset_y * cos
+                    if x + radius < 0 or x - radius > screen_width or y + radius < 0 or y - radius > screen_height:
+                        continue
+
+                chunk = self._chunks.get((chunk_x, chunk_y))
+                if chunk is None:
+                    chunk = self._bake(chunk_x, chunk_y)
+                size = (right_edge - left_edge, bottom_edge - top_edge)
+                if angle != 0:
+                    # Rotated chunks land on whole pixels, 2 more pixels make neighbours overlap instead of
+                    # leaving seams between them
+                    size = (size[0] + 2, size[1] + 2)
+                image = TileMapRenderer.chunk_cache.get(chunk, (0, 0, *chunk.get_size()), size, angle)
+
+                if angle == 0:
+                    camera.screen.blit(image, (left + left_edge, top + top_edge))
+                else:
+                    size = image.get_size()
+                    camera.screen.blit(image, (x - size[0] // 2, y - size[1] // 2))
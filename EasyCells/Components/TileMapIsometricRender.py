@@ -1,17 +1,21 @@
+import math
 import os
-from functools import cache
 from typing import Callable
 
+import numpy as np
 import pygame as pg
 
+from .Camera import Camera
 from .Component import Transform, Component
 from .Sprite import Sprite
+from .SpriteSheet import SpriteSheet
+from .TileMap import TileGrid
 from ..Geometry import Vec2
 
 
-class TileMap3D(Component):
-    def __init__(self, matrix: list[list[list[int]]]):
-        self.matrix = matrix
+class TileMap3D(TileGrid):
+    def __init__(self, matrix: list[list[list[int]]] | np.ndarray):
+        super().__init__(matrix)
         self.size: tuple[int, int, int] = (len(matrix[0][0]), len(matrix[0]), len(matrix))
 
         self.on_tile_change: list[Callable[[int, int, int, int], None]] = []
@@ -21,36 +25,69 @@ class TileMap3D(Component):
 
     def set_tile(self, x: int, y: int, z: int, value: int):
         self.matrix[z][y][x] = value
+        if self._batched((x, y, z)):
+            return
         for callback in self.on_tile_change:
             callback(x, y, z, value)
 
     @staticmethod
     def load_from_csv(dir_path: str) -> 'TileMap3D':
-        mat: list[list[list[int]]] = []
-
-        for file in sorted(os.listdir(f"Assets/{dir_path}")):
-            with open(f"Assets/{dir_path}/{file}") as f:
-                mat.append([list(map(int, line.split(","))) for line in f.readlines()])
-
-        for index, mat0 in enumerate(mat):
-            mat1: list[list[int]] = [[-1 for _ in range(len(mat0[0]))] for _ in range(len(mat0))]
-            for i in range(index, len(mat0) - index):
-                for j in range(index, len(mat0[i]) - index):
-                    mat1[i][j] = mat0[i - index][j - index]
-
-            mat[index] = mat1
-
-        return TileMap3D(mat)
+        """
+        One layer per CSV file of the folder, in name order. Each layer is moved `index` tiles right and down,
+        and cut `index` tiles from its far edges, so upper layers stand on the ones below.
+        """
+        layers = [
+            TileGrid.load_array(f"{dir_path}/{file}")
+            for file in sorted(os.listdir(f"Assets/{dir_path}"))
+        ]
+        height, width = layers[0].shape
+        matrix = np.full((len(layers), height, width), -1, dtype=np.int32)
+        for index, layer in enumerate(layers):
+            if height - 2 * index > 0 and width - 2 * index > 0:
+                matrix[index, index:height - index, index:width - index] = \
+                    layer[:height - 2 * index, :width - 2 * index]
+
+        return TileMap3D(matrix)
+
+
+class IsometricChunk(Sprite):
+    """
+    A block of tiles of a TileMapIsometricRenderer baked in one surface, baked again when drawn after a change.
+    """
+
+    def __init__(self, renderer: 'TileMapIsometricRenderer', chunk: tuple[int, int, int], surface: pg.Surface):
+        super().__init__(surface)
+        self.renderer = renderer
+        # (z, y band, x band)
+        self.chunk = chunk
+        self.dirty = True
+
+    def draw(self, cam_x: float, cam_y: float, scale: float, camera: Camera):
+        if self.dirty:
+            self.renderer.bake(self)
+        super().draw(cam_x, cam_y, scale, camera)
 
 
 class TileMapIsometricRenderer(Component):
+    """
+    Draws its item's TileMap3D as isometric tiles.
+    With a `chunk_size`, each layer is cut in blocks of `chunk_size` x `chunk_size` tiles, each block baked
+    in one IsometricChunk child, and only the blocks of the tiles changed in the TileMap3D are baked again.
+    Blocks are ordered like their first tile (see `get_draw_order`), so sprites given the z of
+    `get_draw_order` are drawn between the blocks around them.
+    Without a `chunk_size` (the default), every tile is a Sprite child.
+    """
     tile_map: TileMap3D
 
-    def __init__(self, tile_set: str | pg.Surface, tile_size: tuple[int, int]):
-        if isinstance(tile_set, str):
-            self.tile_set = pg.image.load(f"Assets/{tile_set}").convert_alpha()
+    def __init__(self, tile_set: str | pg.Surface | SpriteSheet, tile_size: tuple[int, int],
+                 chunk_size: int | None = None):
+        if isinstance(tile_set, SpriteSheet):
+            self.sheet = tile_set
+        elif isinstance(tile_set, str):
+            self.sheet = SpriteSheet.load(tile_set, tile_size)
         else:
-            self.tile_set = tile_set
+            self.sheet = SpriteSheet(tile_set, tile_size)
+        self.tile_set = self.sheet.image
 
         self.tile_size: tuple[int, int] = tile_size
 
@@ -59,9 +96,23 @@ class TileMapIsometricRenderer(Component):
         self.matrix_size = (size[0] // tile_size[0], size[1] // tile_size[1])
         self.sprites: list[Sprite] = []
 
+        self.chunk_size = chunk_size
+        self.chunks: dict[tuple[int, int, int], IsometricChunk] = {}
+
     def init(self):
         self.tile_map = self.GetComponent(TileMap3D)
-        self.update_image()
+        if self.chunk_size is None:
+            self.update_image()
+            return
+        self.tile_map.on_tile_change.append(self._tile_changed)
+        self.tile_map.on_region_change.append(self._region_changed)
+        self.update_chunks()
+
+    def on_destroy(self):
+        tile_map = getattr(self, "tile_map", None)
+        if tile_map is not None and self._tile_changed in tile_map.on_tile_change:
+            tile_map.on_tile_change.remove(self._tile_changed)
+            tile_map.on_region_change.remove(self._region_changed)
 
     def int2coord(self, value: int) -> tuple[int, int]:
         return value % self.matrix_size[0], value // self.matrix_size[0]
@@ -69,11 +120,8 @@ class TileMapIsometricRenderer(Component):
     def coord2int(self, coord: tuple[int, int]) -> int:
         return coord[0] + coord[1] * self.matrix_size[0]
 
-    @cache
     def get_tile(self, x: int, y: int) -> pg.Surface:
-        return self.tile_set.subsurface(
-            (x * self.tile_size[0], y * self.tile_size[1], self.tile_size[0], self.tile_size[1])
-        )
+        return self.sheet.frames[self.coord2int((x, y))]
 
     def get_tile_word_position(self, word_x: float, word_y: float, z_index: int) -> tuple[float, float] | None:
         # Calculate hy (same as in update_image)
@@ -93,30 +141,175 @@ class TileMapIsometricRenderer(Component):
         return x_index, y_index
 
     def world_to_isometric(self, x: float, y: float, z: float) -> tuple[int, int]:
-        pass  # TODO
+        """
+        Tile of the layer `z` whose top is drawn at the world position (x, y), may be outside the map.
+        """
+        origin = self.world_transform
+        x_index, y_index = self.get_tile_word_position(x - origin.x, y - origin.y, z)
+        # Tiles are the diamonds around their center
+        return math.floor(x_index + 0.5), math.floor(y_index + 0.5)
+
+    def pick(self, x: float, y: float) -> tuple[int, int, int] | None:
+        """
+        (x, y, z) of the visible tile at the world position (x, y), the highest one of the tiles drawn there.
+        """
+        width, height, depth = self.tile_map.size
+        for z in range(depth - 1, -1, -1):
+            tile_x, tile_y = self.world_to_isometric(x, y, z)
+            if 0 <= tile_x < width and 0 <= tile_y < height and self.tile_map.get_tile(tile_x, tile_y, z) != -1:
+                return tile_x, tile_y, z
+        return None
+
+    def pick_mouse(self) -> tuple[int, int, int] | None:
+        mouse = Camera.get_global_mouse_position()
+        return self.pick(mouse.x, mouse.y)
+
+    def depth_bucket(self, x: float, y: float, z: int) -> float:
+        """
+        Camera z for something standing on the layer `z` at the world position (x, y): the z of the chunk
+        (or tile, without chunks) under it, so it's drawn right after it and shares its camera layer.
+        """
+        width, height, depth = self.tile_map.size
+        tile_x, tile_y = self.world_to_isometric(x, y, z)
+        tile_x = min(max(tile_x, 0), width - 1)
+        tile_y = min(max(tile_y, 0), height - 1)
+        z = min(max(z, 0), depth - 1)
+        if self.chunk_size is None:
+            return self.get_draw_order(tile_x, tile_y, z)
+        return self.get_draw_order(
+            tile_x - tile_x % self.chunk_size, tile_y - tile_y % self.chunk_size, z
+        )
 
     def get_draw_order(self, x: float, y: float, z: float) -> float:
         return -0.01 * (x + y * self.tile_map.size[0] + z * self.tile_map.size[0] * self.tile_map.size[1])
 
+    def _hy(self) -> int:
+        return (sum(self.tile_map.size) * self.tile_size[1] // 4 + self.tile_size[1] // 2) // 4
+
+    def _chunk_area(self, chunk: tuple[int, int, int]) -> tuple[int, int, int, int]:
+        """
+        (left, top, width, height) of every tile the chunk may have, relative to the renderer.
+        """
+        z, band_y, band_x = chunk
+        first_x, first_y = band_x * self.chunk_size, band_y * self.chunk_size
+        last_x = min(first_x + self.chunk_size, self.tile_map.size[0]) - 1
+        last_y = min(first_y + self.chunk_size, self.tile_map.size[1]) - 1
+        width, height = self.tile_size
+        hy = self._hy()
+
+        # Leftmost tile is (first_x, last_y), rightmost (last_x, first_y), top (first_x, first_y)...
+        left = (first_x - last_y) * width // 2 - width // 2
+        right = (last_x - first_y) * width // 2 - width // 2 + width
+        top = ((first_x + first_y) * height // 4 - z * height // 2) - hy - height // 2
+        bottom = ((last_x + last_y) * height // 4 - z * height // 2) - hy - height // 2 + height
+        return left, top, right - left, bottom - top
+
+    def update_chunks(self):
+        """
+        Creates the chunks with tiles, in (z, y band, x band) order.
+        """
+        matrix = np.asarray(self.tile_map.matrix)
+        size = self.chunk_size
+        for z in range(self.tile_map.size[2]):
+            for band_y in range(math.ceil(self.tile_map.size[1] / size)):
+                for band_x in range(math.ceil(self.tile_map.size[0] / size)):
+                    tiles = matrix[z, band_y * size:(band_y + 1) * size, band_x * size:(band_x + 1) * size]
+                    if (tiles != -1).any():
+                        self._chunk((z, band_y, band_x))
+
+    def _chunk(self, chunk: tuple[int, int, int]) -> IsometricChunk:
+        """
+        The chunk, created empty and marked to be baked if it didn't exist.
+        """
+        drawable = self.chunks.get(chunk)
+        if drawable is not None:
+            drawable.dirty = True
+            return drawable
+
+        left, top, width, height = self._chunk_area(chunk)
+        z, band_y, band_x = chunk
+        drawable = self.item.CreateChild().AddComponent(
+            IsometricChunk(self, chunk, pg.Surface((width, height), pg.SRCALPHA))
+        )
+        drawable.transform.position = Vec2(left + width // 2, top + height // 2)
+        drawable.transform.z = self.get_draw_order(band_x * self.chunk_size, band_y * self.chunk_size, z)
+        self.chunks[chunk] = drawable
+        return drawable
+
+    def bake(self, drawable: IsometricChunk):
+        """
+        Draws the tiles of a chunk on its surface, layer by layer, back to front.
+        """
+        z, band_y, band_x = drawable.chunk
+        left, top, _, _ = self._chunk_area(drawable.chunk)
+        width, height = self.tile_size
+        hy = self._hy()
+        frames = self.sheet.frames
+        layer = self.tile_map.matrix[z]
+
+        surface = drawable.image
+        surface.fill((0, 0, 0, 0))
+        first_x, first_y = band_x * self.chunk_size, band_y * self.chunk_size
+        for y in range(first_y, min(first_y + self.chunk_size, self.tile_map.size[1])):
+            row = layer[y]
+            for x in range(first_x, min(first_x + self.chunk_size, self.tile_map.size[0])):
+                tile = row[x]
+                if tile == -1:
+                    continue
+                surface.blit(frames[tile], (
+                    (x - y) * width // 2 - width // 2 - left,
+                    ((x + y) * height // 4 - z * height // 2) - hy - height // 2 - top
+                ))
+
+        Sprite.surface_cache.clear(surface)
+        drawable.dirty = False
+
+    def _tile_changed(self, x: int, y: int, z: int, value: int):
+        chunk = (z, y // self.chunk_size, x // self.chunk_size)
+        if value != -1 or chunk in self.chunks:
+            self._chunk(chunk)
+
+    def _region_changed(self, origin: tuple[int, int, int], size: tuple[int, int, int]):
+        for z in range(origin[2], origin[2] + size[2]):
+            for band_y in range(origin[1] // self.chunk_size, (origin[1] + size[1] - 1) // self.chunk_size + 1):
+                for band_x in range(origin[0] // self.chunk_size, (origin[0] + size[0] - 1) // self.chunk_size + 1):
+                    self._chunk((z, band_y, band_x))
+
     def update_image(self):
         hy = (sum(self.tile_map.size) * self.tile_size[1] // 4 + self.tile_size[1] // 2) // 4
 
-        draw_ord = 0.01
         for z in range(self.tile_map.size[2]):
             for y in range(self.tile_map.size[1]):
                 for x in range(self.tile_map.size[0]):
                     tile = self.tile_map.get_tile(x, y, z)
-                    draw_ord -= 0.01
-                    # print(f"x: {x}, y: {y}, z: {z}, draw_ord: {draw_ord}, draw_ord_from func: {self.get_draw_order(x, y, z)}")
                     if tile == -1:
                         continue
 
-                    sprite = self.item.CreateChild().AddComponent(Sprite(
-                        self.get_tile(*self.int2coord(tile))
-                    ))
+                    sprite = self.item.CreateChild().AddComponent(Sprite(self.sheet, index=tile))
                     sprite.transform.position = Vec2(
                         (x - y) * self.tile_size[0] // 2,
                         ((x + y) * self.tile_size[1] // 4 - z * self.tile_size[1] // 2) - hy
                     )
-                    sprite.transform.z = draw_ord
-
+                    # The same z as depth_bucket, so sprites standing on the tile are drawn after it
+                    sprite.transform.z = self.get_draw_order(x, y, z)
+
+
+class IsometricDepth(Component):
+    """
+    Keeps the z of its item in the depth bucket (see `TileMapIsometricRenderer.depth_bucket`) of the tile
+    under it, so a moving sprite is drawn between the tiles of the map. The z only changes when the item
+    moves to another bucket, and the camera puts it in the layer of that bucket without sorting its layers.
+    """
+
+    def __init__(self, renderer: TileMapIsometricRenderer, height: int = 0):
+        """
+        height: layer of the map the item stands on.
+        """
+        self.renderer = renderer
+        self.height = height
+
+    def loop(self):
+        world = self.world_transform
+        z = self.renderer.depth_bucket(world.x, world.y, self.height)
+        if z != self.transform.z:
+            self.transform.z = z
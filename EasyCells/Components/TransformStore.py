@@ -0,0 +1,361 @@
+import math
+
+import numpy as np
+
+from .Component import Transform
+from ..Geometry import Vec2
+
+TAU = 2 * math.pi
+
+
+class TransformStore:
+    """
+    Keeps the transforms of every item of a Game in contiguous NumPy arrays (struct of arrays),
+    so the world transforms of all items are computed in one vectorized pass per frame (`propagate`),
+    one NumPy operation per hierarchy level instead of one `ToGlobal` per item.
+
+    Enable it with `Game(transform_store=True)`, items then get a `StoredTransform` view into the arrays.
+    World transforms are computed at the start of the frame (after the fixed updates), so moving an item
+    during the frame shows up in the world transforms of the next one.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity = 0
+        self.count = 0  # Slots in use, including freed ones below the top
+        self._free: list[int] = []
+        self._levels: list[np.ndarray] | None = None
+
+        # Local transforms
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.z = np.zeros(0)
+        self.angle = np.zeros(0)
+        self.scale = np.zeros(0)
+        self.parent = np.zeros(0, dtype=np.int64)
+        self.alive = np.zeros(0, dtype=bool)
+
+        # World transforms, written by `propagate`
+        self.world_x = np.zeros(0)
+        self.world_y = np.zeros(0)
+        self.world_z = np.zeros(0)
+        self.world_angle = np.zeros(0)
+        self.world_scale = np.zeros(0)
+        self.world_cos = np.zeros(0)
+        self.world_sin = np.zeros(0)
+        self.world_version = np.zeros(0, dtype=np.int64)
+
+        self._grow(capacity)
+
+    def _grow(self, capacity: int):
+        for name in ("x", "y", "z", "angle", "scale", "world_x", "world_y", "world_z", "world_angle",
+                     "world_scale", "world_cos", "world_sin", "world_version", "parent", "alive"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+        self.parent[self.capacity:] = -1
+        self.capacity = capacity
+
+    def create(self, parent: 'StoredTransform | None' = None) -> 'StoredTransform':
+        if self._free:
+            index = self._free.pop()
+        else:
+            if self.count == self.capacity:
+                self._grow(self.capacity * 2)
+            index = self.count
+            self.count += 1
+
+        self.x[index] = self.y[index] = self.z[index] = self.angle[index] = 0.0
+        self.scale[index] = 1.0
+        self.parent[index] = parent.index if parent is not None else -1
+        self.alive[index] = True
+        self._levels = None
+
+        transform = StoredTransform(self, index)
+        self.world_of(index)
+        return transform
+
+    def release(self, transform: 'StoredTransform'):
+        index = transform.index
+        if not self.alive[index]:
+            return
+        self.alive[index] = False
+        self.parent[index] = -1
+        self._free.append(index)
+        self._levels = None
+
+    def set_parent(self, transform: 'StoredTransform', parent: 'StoredTransform | None'):
+        self.parent[transform.index] = parent.index if parent is not None else -1
+        self._levels = None
+
+    def _build_levels(self) -> list[np.ndarray]:
+        """
+        Indices of the live transforms grouped by depth in the hierarchy, roots first.
+        """
+        count = self.count
+        parent = self.parent[:count]
+        alive = self.alive[:count]
+        depth = np.where(parent < 0, 0, -1)
+
+        levels = []
+        current = np.flatnonzero(alive & (depth == 0))
+        level = 0
+        while current.size:
+            levels.append(current)
+            level += 1
+            is_child = np.isin(parent, current) & alive
+            depth[is_child] = level
+            current = np.flatnonzero(is_child)
+        return levels
+
+    def propagate(self):
+        """
+        Computes the world transform of every live item.
+        """
+        if self._levels is None:
+            self._levels = self._build_levels()
+        if not self._levels:
+            return
+
+        roots = self._levels[0]
+        self.world_x[roots] = self.x[roots]
+        self.world_y[roots] = self.y[roots]
+        self.world_z[roots] = self.z[roots]
+        self.world_angle[roots] = self.angle[roots]
+        self.world_scale[roots] = self.scale[roots]
+        self.world_cos[roots] = np.cos(self.world_angle[roots])
+        self.world_sin[roots] = np.sin(self.world_angle[roots])
+
+        for indices in self._levels[1:]:
+            parents = self.parent[indices]
+            cos = self.world_cos[parents]
+            sin = self.world_sin[parents]
+            scale = self.world_scale[parents]
+            x = self.x[indices]
+            y = self.y[indices]
+
+            self.world_x[indices] = (x * cos - y * sin) * scale + self.world_x[parents]
+            self.world_y[indices] = (x * sin + y * cos) * scale + self.world_y[parents]
+            self.world_z[indices] = self.z[indices] + self.world_z[parents]
+            angle = (self.angle[indices] + self.world_angle[parents]) % TAU
+            self.world_angle[indices] = angle
+            self.world_scale[indices] = self.scale[indices] * scale
+            self.world_cos[indices] = np.cos(angle)
+            self.world_sin[indices] = np.sin(angle)
+
+        self.world_version[:self.count] += 1
+
+    def world_of(self, index: int) -> 'WorldTransform':
+        """
+        Computes the world transform of a single item now, walking its parents.
+        """
+        chain = []
+        while index >= 0:
+            chain.append(index)
+            index = int(self.parent[index])
+
+        world_x = world_y = world_z = world_angle = 0.0
+        world_scale, cos, sin = 1.0, 1.0, 0.0
+        for index in reversed(chain):
+            x, y = float(self.x[index]), float(self.y[index])
+            world_x, world_y = (x * cos - y * sin) * world_scale + world_x, (x * sin + y * cos) * world_scale + world_y
+            world_z += float(self.z[index])
+            world_angle = (world_angle + float(self.angle[index])) % TAU
+            world_scale *= float(self.scale[index])
+            cos, sin = math.cos(world_angle), math.sin(world_angle)
+
+            self.world_x[index] = world_x
+            self.world_y[index] = world_y
+            self.world_z[index] = world_z
+            self.world_angle[index] = world_angle
+            self.world_scale[index] = world_scale
+            self.world_cos[index] = cos
+            self.world_sin[index] = sin
+            self.world_version[index] += 1
+
+        return WorldTransform(self, chain[0])
+
+    def visible(self, indices: np.ndarray, radius: np.ndarray, center: Vec2[float],
+                half_size: Vec2[float]) -> np.ndarray:
+        """
+        Mask of the `indices` whose world position, padded by `radius` times their world scale,
+        touches the rectangle `center` +- `half_size` (world units).
+        """
+        padding = radius * self.world_scale[indices]
+        return (np.abs(self.world_x[indices] - center.x) <= half_size.x + padding) & \
+            (np.abs(self.world_y[indices] - center.y) <= half_size.y + padding)
+
+
+class StoredTransform(Transform):
+    """
+    A Transform whose values live in a `TransformStore`.
+    """
+
+    def __init__(self, store: TransformStore, index: int):
+        self.store = store
+        self.index = index
+        self.version = 0
+        self.world = WorldTransform(store, index)
+        self.listeners = None
+
+    @property
+    def _x(self) -> float:
+        return float(self.store.x[self.index])
+
+    @property
+    def _y(self) -> float:
+        return float(self.store.y[self.index])
+
+    @property
+    def _z(self) -> float:
+        return float(self.store.z[self.index])
+
+    @property
+    def _angle(self) -> float:
+        return float(self.store.angle[self.index])
+
+    @property
+    def _scale(self) -> float:
+        return float(self.store.scale[self.index])
+
+    @property
+    def _cos(self) -> float:
+        return math.cos(self._angle)
+
+    @property
+    def _sin(self) -> float:
+        return math.sin(self._angle)
+
+    @property
+    def x(self) -> float:
+        return float(self.store.x[self.index])
+
+    @x.setter
+    def x(self, value: float):
+        self.store.x[self.index] = value
+        self.version += 1
+        if self.listeners:
+            self._changed()
+
+    @property
+    def y(self) -> float:
+        return float(self.store.y[self.index])
+
+    @y.setter
+    def y(self, value: float):
+        self.store.y[self.index] = value
+        self.version += 1
+        if self.listeners:
+            self._changed()
+
+    @property
+    def z(self) -> float:
+        return float(self.store.z[self.index])
+
+    @z.setter
+    def z(self, value: float):
+        self.store.z[self.index] = value
+        self.version += 1
+        if self.listeners:
+            self._changed()
+
+    @property
+    def angle(self) -> float:
+        return float(self.store.angle[self.index])
+
+    @angle.setter
+    def angle(self, value: float):
+        self.store.angle[self.index] = value % TAU
+        self.version += 1
+        if self.listeners:
+            self._changed()
+
+    @property
+    def scale(self) -> float:
+        return float(self.store.scale[self.index])
+
+    @scale.setter
+    def scale(self, value: float):
+        self.store.scale[self.index] = value if value > 0.0001 else 0.0001
+        self.version += 1
+        if self.listeners:
+            self._changed()
+
+    @property
+    def position(self) -> Vec2[float]:
+        return Vec2(float(self.store.x[self.index]), float(self.store.y[self.index]))
+
+    @position.setter
+    def position(self, value: Vec2[float]):
+        self.store.x[self.index] = value.x
+        self.store.y[self.index] = value.y
+        self.version += 1
+        if self.listeners:
+            self._changed()
+
+    def copy_from(self, other: Transform):
+        self.store.x[self.index] = other.x
+        self.store.y[self.index] = other.y
+        self.store.z[self.index] = other.z
+        self.store.angle[self.index] = other.angle
+        self.store.scale[self.index] = other.scale
+        self.version += 1
+        if self.listeners:
+            self._changed()
+
+    def SetGlobal(self):
+        Transform.Global = self.world
+
+
+class WorldTransform(StoredTransform):
+    """
+    Read only view of the world transform of an item in a `TransformStore`, kept current by `propagate`.
+    """
+
+    def __init__(self, store: TransformStore, index: int):
+        self.store = store
+        self.index = index
+
+    @property
+    def version(self) -> int:
+        return int(self.store.world_version[self.index])
+
+    @property
+    def _x(self) -> float:
+        return float(self.store.world_x[self.index])
+
+    @property
+    def _y(self) -> float:
+        return float(self.store.world_y[self.index])
+
+    @property
+    def _z(self) -> float:
+        return float(self.store.world_z[self.index])
+
+    @property
+    def _angle(self) -> float:
+        return float(self.store.world_angle[self.index])
+
+    @property
+    def _scale(self) -> float:
+        return float(self.store.world_scale[self.index])
+
+    @property
+    def _cos(self) -> float:
+        return float(self.store.world_cos[self.index])
+
+    @property
+    def _sin(self) -> float:
+        return float(self.store.world_sin[self.index])
+
+    x = property(lambda self: float(self.store.world_x[self.index]))
+    y = property(lambda self: float(self.store.world_y[self.index]))
+    z = property(lambda self: float(self.store.world_z[self.index]))
+    angle = property(lambda self: float(self.store.world_angle[self.index]))
+    scale = property(lambda self: float(self.store.world_scale[self.index]))
+    position = property(lambda self: Vec2(float(self.store.world_x[self.index]),
+                                          float(self.store.world_y[self.index])))
+
+    @property
+    def world(self) -> 'WorldTransform':
+        return self
@@ -1,17 +1,29 @@
 from .Animator import Animator, Animation
 from .Camera import Camera
 from .Component import Component, Item, Transform
+from .ComponentRegistry import ComponentRegistry
+from .ItemPool import ItemPool
+from .Prefab import Prefab
 from .Sprite import Sprite
-from .Spritestacks import SpriteStacks
-from .TileMap import TileMap
-from .TileMapIsometricRender import TileMap3D, TileMapIsometricRenderer
+from .SpriteSheet import SpriteSheet
+from .Spritestacks import SpriteStacks, SpriteStackModel
+from .SurfaceCache import SurfaceCache
+from .TileMap import TileGrid, TileMap
+from .TileMapIsometricRender import TileMap3D, TileMapIsometricRenderer, IsometricChunk, IsometricDepth
+from .TransformStore import TransformStore, StoredTransform
 
 __all__ = [
     'Animator', 'Animation',
     'Camera',
     'Component', 'Item', 'Transform',
+    'ComponentRegistry',
+    'ItemPool',
+    'Prefab',
     'Sprite',
-    'SpriteStacks',
-    'TileMap', 'TileMap3D',
-    'TileMapIsometricRenderer'
+    'SpriteSheet',
+    'SpriteStacks', 'SpriteStackModel',
+    'SurfaceCache',
+    'TileGrid', 'TileMap', 'TileMap3D',
+    'TileMapIsometricRenderer', 'IsometricChunk', 'IsometricDepth',
+    'TransformStore', 'StoredTransform',
 ]
\ No newline at end of file
@@ -1,5 +1,8 @@
 import asyncio
+import os
 import sys
+import time
+import traceback
 from importlib import import_module
 from types import ModuleType
 from typing import Callable, TYPE_CHECKING
@@ -8,11 +11,13 @@ import pygame as pg
 from pygame.event import Event
 
 from EasyCells.NewGame import NewGame
+from EasyCells.profiler import Profiler, ProfilerOverlay
 
 if TYPE_CHECKING:
-    from EasyCells.Components import Item
+    from EasyCells.Components import Component, Item, ItemPool
 
 ItemClass: type
+ItemPoolClass: type
 
 pg.init()
 
@@ -38,7 +43,7 @@ class Game:
     @game_name.setter
     def game_name(self, value: str):
         self._game_name = value
-        if not self.show_fps:
+        if not self.headless:
             pg.display.set_caption(value)
 
     def __init__(
@@ -49,19 +54,49 @@ class Game:
             screen_resolution: tuple[int, int] = (800, 600),
             screen_flag: int = 0,
             screen: pg.Surface | None = None,
+            scheduler_backend: str = "heap",
+            fps_limit: int = 1000,
+            fixed_update_rate: float | None = None,
+            max_fixed_steps: int = 5,
+            headless: bool = False,
+            transform_store: bool = False,
     ):
+        """
+        scheduler_backend["heap" | "wheel"]: timer queue used by `Game.scheduler`,
+        "wheel" is faster when tens of thousands of short timers are pending.
+        fps_limit: maximum number of rendered frames per second, 0 for no limit.
+        fixed_update_rate: if set, the functions in `Game.fixed_updates` run this many times per second of
+        game time with a constant `fixed_delta_time`, no matter the frame rate.
+        max_fixed_steps: maximum fixed steps run in a single frame, the rest of the backlog is dropped.
+        headless: run without a window (SDL dummy video driver), Cameras don't draw and the frame rate isn't
+        capped, for servers and benchmarks. `screen` is then an off-screen surface of `screen_resolution`.
+        transform_store: keep the item transforms in NumPy arrays (see `TransformStore`), world transforms and
+        Sprite culling are then computed in one vectorized pass per frame. Pays off with thousands of items.
+        """
         # imports: -=-=-=-=-
-        global ItemClass
+        global ItemClass, ItemPoolClass
         from EasyCells.scheduler import Scheduler
-        from EasyCells.Components import Item
+        from EasyCells.Components import Item, ItemPool, TransformStore, ComponentRegistry
+        from EasyCells.commands import CommandBuffer
         ItemClass = Item
+        ItemPoolClass = ItemPool
         # imports: -=-=-=-=-
 
         self.my_instance = Game.instances_count
         Game.instances[self.my_instance] = self
         Game.instances_count += 1
 
-        if screen is None:
+        self.headless = headless
+
+        if headless:
+            if pg.display.get_surface() is None:
+                # Images still need a display mode to convert, so set a tiny one on the dummy driver
+                pg.display.quit()
+                os.environ["SDL_VIDEODRIVER"] = "dummy"
+                pg.display.init()
+                pg.display.set_mode((1, 1))
+            self.screen: pg.Surface = screen if screen is not None else pg.Surface(screen_resolution, pg.SRCALPHA)
+        elif screen is None:
             self.screen: pg.Surface = pg.display.set_mode(screen_resolution, screen_flag)
         else:
             self.screen: pg.Surface = screen
@@ -72,13 +107,40 @@ class Game:
         self.game_name = game_name
 
         self.clock = pg.time.Clock()
-        self.time = pg.time.get_ticks()
-        self.last_time = pg.time.get_ticks()
+        self.time = self.get_ticks()
+        self.last_time = self.time
         self.delta_time = 0
         self.run_time = 0
-        self.scheduler = Scheduler(self)
+        self.fps_limit = fps_limit
+
+        self.fixed_delta_time: float | None = 1 / fixed_update_rate if fixed_update_rate else None
+        self.max_fixed_steps = max_fixed_steps
+        self.fixed_time = 0
+        # How far the current frame is between the last fixed step and the next one [0, 1)
+        self.interpolation_alpha = 1.0
+        self.fixed_updates: list[Callable[[float], None]] = []
+        self._accumulator = 0.0
+
+        self.profiler: Profiler | None = None
+        self.overlay = ProfilerOverlay()
+
+        self.transform_store: TransformStore | None = TransformStore() if transform_store else None
+        self.registry = ComponentRegistry()
+        # Component classes with a `loop_batch`, in the order they first appeared
+        self.batch_types: dict[type, None] = {}
+        # Batched class -> (registry version, its components in active subtrees)
+        self._batches: dict[type, tuple[int, tuple['Component', ...]]] = {}
+
+        self.scheduler = Scheduler(self, scheduler_backend)
         self.item_list: list[Item] = []
+        self._item_list_cache: tuple[Item, ...] | None = None
+        # True while the frame updates the items, structural changes are queued in `commands` meanwhile
+        self.deferring = False
+        self.commands = CommandBuffer()
+        self.pools: list[ItemPool] = []
         self.to_init: list[Callable] = []
+        # Counts the calls to new_game, a level loaded again is a new load
+        self.level_loads = 0
         self.new_game(start_level, supress=True)
         # pg.mouse.set_visible
 
@@ -91,13 +153,23 @@ class Game:
         else:
             self.level = import_module(f".{level}", "Levels")
             self.current_level = level
-
+        self.level_loads += 1
 
         self.run_time = 0
+        self.fixed_time = 0
+        self._accumulator = 0.0
+        self.fixed_updates.clear()
+
+        # Changes queued earlier in the frame are applied before the level is unloaded
+        self.deferring = False
+        self.commands.flush()
 
         for item in list(self.item_list):
             if item.destroy_on_load:
                 item.Destroy()
+        # The pools stay, but the items waiting in them belong to the old level
+        for pool in self.pools:
+            pool.clear()
 
         self.scheduler.clear()
         self.level.init(self)
@@ -110,6 +182,37 @@ class Game:
     def CreateItem(self) -> 'Item':
         return ItemClass(self)
 
+    def CreatePool(self, factory: Callable[['Game'], 'Item'], on_spawn: Callable[..., None] | None = None,
+                   on_release: Callable[['Item'], None] | None = None, max_size: int | None = None) -> 'ItemPool':
+        """
+        A pool of reusable items built by `factory(game)`, see `ItemPool`.
+        """
+        pool = ItemPoolClass(self, factory, on_spawn, on_release, max_size)
+        self.pools.append(pool)
+        return pool
+
+    def _add_root(self, item: 'Item'):
+        item._list_index = len(self.item_list)
+        self.item_list.append(item)
+        self._item_list_cache = None
+
+    def _remove_root(self, item: 'Item'):
+        # Swap with the last root and pop, the order of the roots isn't kept
+        index = item._list_index
+        assert 0 <= index < len(self.item_list) and self.item_list[index] is item, f"{item} isn't a root"
+        last = self.item_list.pop()
+        if last is not item:
+            self.item_list[index] = last
+            last._list_index = index
+        item._list_index = -1
+        self._item_list_cache = None
+
+    def query(self, component_type: type) -> tuple:
+        """
+        All the components of `component_type` in the game (subclasses included), see `ComponentRegistry`.
+        """
+        return self.registry.query(component_type)
+
     def update(self):
         Game.events = pg.event.get()
         for event in Game.events:
@@ -117,71 +220,155 @@ class Game:
                 pg.quit()
                 sys.exit()
 
-        pg.display.flip()
-        self.screen.fill((30, 30, 30))  # Cinza
-        self.clock.tick(1000)
+        if self.headless:
+            self.clock.tick()
+        else:
+            pg.display.flip()
+            self.screen.fill((30, 30, 30))  # Cinza
+            self.clock.tick(self.fps_limit)
         self.last_time = self.time
-        self.time = pg.time.get_ticks()
+        self.time = self.get_ticks()
         self.delta_time = (self.time - self.last_time) / 1000.0
         self.run_time += self.delta_time
 
-        if self.show_fps:
-            pg.display.set_caption(f'{self.game_name}   FPS: {self.clock.get_fps():.0f}')
+    def enable_profiler(self, size: int = 300) -> Profiler:
+        """
+        Starts recording the time of each frame section in `Game.profiler`, see `Profiler`.
+        size: number of frames kept.
+        """
+        if self.profiler is None:
+            self.profiler = Profiler(size)
+        return self.profiler
+
+    def disable_profiler(self):
+        self.profiler = None
+
+    def get_ticks(self) -> float:
+        """
+        Milliseconds clock used for `Game.time`. Headless games use a sub-millisecond clock,
+        since their frames are often shorter than one millisecond.
+        """
+        if self.headless:
+            return time.perf_counter() * 1000.0
+        return pg.time.get_ticks()
+
+    def fixed_update(self):
+        """
+        Runs the fixed steps owed for the time elapsed since the last frame.
+        """
+        if self.fixed_delta_time is None:
+            return
+
+        self._accumulator += self.delta_time
+        steps = 0
+        while self._accumulator >= self.fixed_delta_time:
+            if steps >= self.max_fixed_steps:
+                # Too far behind, drop the backlog instead of spiraling
+                self._accumulator %= self.fixed_delta_time
+                break
+
+            for function in list(self.fixed_updates):
+                try:
+                    function(self.fixed_delta_time)
+                except (KeyboardInterrupt, SystemExit, NewGame) as e:
+                    raise e
+                except Exception as e:
+                    print(f"Error in {function}:\n    {e}")
+                    traceback.print_exc()
+
+            self.fixed_time += self.fixed_delta_time
+            self._accumulator -= self.fixed_delta_time
+            steps += 1
+
+        self.interpolation_alpha = self._accumulator / self.fixed_delta_time
+
+    def update_batches(self):
+        """
+        Calls `loop_batch` of every batched component class with its enabled components,
+        skipping the ones in inactive subtrees like `Item.update` does.
+        """
+        profiler = self.profiler
+        version = self.registry.version
+        for cls in self.batch_types:
+            batch = self._batches.get(cls)
+            if batch is None or batch[0] != version:
+                batch = self._batches[cls] = (version, tuple(
+                    component for component in self.registry.query(cls)
+                    if component.__class__ is cls and component.item.in_active_tree()
+                ))
+            components = [component for component in batch[1] if component.enable]
+            if not components:
+                continue
 
-    def run(self):
-        while True:
-            self.update()
             try:
-                for function in self.to_init:
-                    function()
-                self.to_init.clear()
-
-                for item in list(self.item_list):
-                    item.update()
+                if profiler is None:
+                    cls.loop_batch(components)
+                else:
+                    start = time.perf_counter()
+                    cls.loop_batch(components)
+                    profiler.add(f"loop_batch:{cls.__name__}", time.perf_counter() - start)
+            except (KeyboardInterrupt, SystemExit, NewGame) as e:
+                raise e
+            except Exception as e:
+                print(f"Error in {cls.__name__}.loop_batch:\n    {e}")
+                traceback.print_exc()
+
+    def _frame(self):
+        self.update()
+        profiler = self.profiler
+        try:
+            for function in self.to_init:
+                function()
+            self.to_init.clear()
 
-                self.level.loop(self)
+            self.deferring = True
+            self.fixed_update()
 
-                self.scheduler.update()
-            except NewGame:
-                pass
+            self.update_batches()
 
-    async def run_async(self):
-        while True:
-            self.update()
-            try:
-                for function in self.to_init:
-                    function()
-                self.to_init.clear()
+            if self.transform_store is not None:
+                self.transform_store.propagate()
 
-                for item in list(self.item_list):
+            items = self._item_list_cache
+            if items is None:
+                items = self._item_list_cache = tuple(self.item_list)
+            for item in items:
+                # Sleeping items have nothing to loop
+                if item._subtree_loopers and item._active:
                     item.update()
 
-                self.level.loop(self)
+            self.level.loop(self)
 
+            if profiler is None:
+                self.scheduler.update()
+            else:
+                start = time.perf_counter()
                 self.scheduler.update()
-            except NewGame:
-                pass
+                profiler.add("scheduler", time.perf_counter() - start)
+        except NewGame:
+            pass
+        finally:
+            self.deferring = False
+        self.commands.flush()
 
-            await asyncio.sleep(0)
+        if not self.headless and (self.show_fps or (profiler is not None and profiler.show_overlay)):
+            self.overlay.draw(self)
+        if profiler is not None:
+            profiler.end_frame()
+
+    def run(self):
+        while True:
+            self._frame()
 
+    async def run_async(self):
+        while True:
+            self._frame()
+            await asyncio.sleep(0)
 
     def run_once(self):
         previous_instance: int = Game.current_instance
         Game.current_instance = self.my_instance
 
-        self.update()
-        try:
-            for function in self.to_init:
-                function()
-            self.to_init.clear()
-
-            for item in list(self.item_list):
-                item.update()
-
-            self.level.loop(self)
-
-            self.scheduler.update()
-        except NewGame:
-            pass
+        self._frame()
 
         Game.current_instance = previous_instance
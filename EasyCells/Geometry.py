@@ -2,7 +2,7 @@ import math
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Vec2[T]:
     x: T
     y: T
@@ -34,6 +34,34 @@ class Vec2[T]:
     def __neg__(self):
         return Vec2(-self.x, -self.y)
 
+    # In place operators, change this vector instead of allocating a new one.
+    # Don't use them on a vector that is shared (e.g. a constant like Rigidbody.Gravity)
+
+    def __iadd__(self, other):
+        self.x += other.x
+        self.y += other.y
+        return self
+
+    def __isub__(self, other):
+        self.x -= other.x
+        self.y -= other.y
+        return self
+
+    def __imul__(self, other: T):
+        self.x *= other
+        self.y *= other
+        return self
+
+    def __itruediv__(self, other: T):
+        self.x /= other
+        self.y /= other
+        return self
+
+    def set(self, x: T, y: T) -> 'Vec2[T]':
+        self.x = x
+        self.y = y
+        return self
+
     @property
     def to_tuple(self):
         return self.x, self.y
@@ -2,6 +2,7 @@ import ipaddress
 from weakref import WeakValueDictionary
 from enum import Enum, auto
 from functools import wraps
+from time import perf_counter
 from typing import Callable, Any
 
 from EasyCells.Components.Component import Component
@@ -363,11 +364,17 @@ class NetworkManager(Component):
             self.item.destroy_on_load = False
 
     def loop(self):
+        profiler = self.game.profiler
+        start = perf_counter() if profiler is not None else 0.0
+
         if self.is_server:
             self._server_loop()
         else:
             self._client_loop()
 
+        if profiler is not None:
+            profiler.add("network", perf_counter() - start)
+
     def _server_loop(self):
         # Ler TCP
         clients_tcp = self.tcp_server.clients
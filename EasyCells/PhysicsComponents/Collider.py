@@ -63,37 +63,46 @@ class Collider(Component):
     @debug.setter
     def debug(self, value):
         self._debug = value
+        # Only debug colliders loop, the others sleep
         if value:
             self.loop = self.loop_debug
         else:
-            self.loop = self.loop_no_debug
+            self.__dict__.pop("loop", None)
+        if "item" in self.__dict__:
+            self.item.refresh_loopers()
+
+    @property
+    def word_position(self) -> Transform:
+        return self.world_transform
 
     def __init__(self, polygons: List[Polygon], mask: int = 1, debug: bool = False):
         """
         polygons: list of Polygon objects
         mask: collision mask (bitwise)
         """
-        self.word_position = Transform()
         self.polygons: List[Polygon] = polygons
         self.compile_numba_functions()
         self.mask = mask
         self.debug = debug
-        Collider.colliders.append(self)
 
     def init(self):
-        self.word_position = self.CalculateGlobalTransform()
+        Collider.colliders.append(self)
 
     def on_destroy(self):
-        Collider.colliders.remove(self)
+        # Not registered if destroyed before its first frame
+        if self in Collider.colliders:
+            Collider.colliders.remove(self)
         self.on_destroy = lambda: None
 
+    def on_release(self):
+        Collider.colliders.remove(self)
+
+    def on_spawn(self):
+        Collider.colliders.append(self)
+
     def loop_debug(self):
-        self.word_position = Transform.Global
         Camera.instance().debug_draws.append(self.draw)
 
-    def loop_no_debug(self):
-        self.word_position = Transform.Global
-
     def draw(self, cam_x: float, cam_y: float, scale: float, camera: Camera):
         """
         For debug only
@@ -4,6 +4,7 @@ from typing import List
 from .. import Game
 from ..Components import Component
 from ..Geometry import Vec2
+from ..scheduler import TimerHandle
 from .Collider import Collider
 
 
@@ -15,14 +16,16 @@ class Rigidbody(Component):
 
     IMPORTANT USAGE NOTE:
     The physics simulation runs in the `physics_step` static method.
-    For stable and predictable physics, you should call this method from your
-    main game loop at a fixed interval (Fixed Update).
+    For stable and predictable physics, create the Game with `fixed_update_rate`
+    so `start_physics` runs it at a fixed interval (Fixed Update).
     """
 
     # A static list containing all active rigidbodies in the scene.
     RigidBodies: List[Rigidbody] = []
     # Global gravity force, can be adjusted for your game's scale.
     Gravity = Vec2(0, 980)  # Using a value suitable for pixel-based coordinates
+    # Scheduler handle of the running physics loop
+    physics_handle: TimerHandle | None = None
 
     def __init__(self, mass: float = 1.0, use_gravity: bool = True, is_kinematic: bool = False,
                  drag: float = 0.05, angular_drag: float = 0.05, gravity_scale: float = 1.0,
@@ -57,6 +60,10 @@ class Rigidbody(Component):
         self._force_accumulator = Vec2(0, 0)
         self._torque_accumulator = 0.0
 
+        # State before the last integration, used to interpolate between fixed steps
+        self.previous_position: Vec2 | None = None
+        self.previous_angle: float = 0.0
+
         self.collider: Collider | None = None
 
     def init(self):
@@ -68,6 +75,12 @@ class Rigidbody(Component):
         if self not in Rigidbody.RigidBodies:
             Rigidbody.RigidBodies.append(self)
 
+    def on_clone(self):
+        self.velocity = Vec2(self.velocity.x, self.velocity.y)
+        self._force_accumulator = Vec2(0, 0)
+        self._torque_accumulator = 0.0
+        self.previous_position = None
+
     def on_destroy(self):
         if self in Rigidbody.RigidBodies:
             Rigidbody.RigidBodies.remove(self)
@@ -81,26 +94,53 @@ class Rigidbody(Component):
             return
         self.velocity += impulse * self.inv_mass
 
-    def loop(self):
-        pass
+    @property
+    def interpolated_position(self) -> Vec2:
+        """
+        Local position blended between the last two fixed steps by `Game.interpolation_alpha`.
+        """
+        if self.previous_position is None:
+            return self.transform.position
+        alpha = self.game.interpolation_alpha
+        return self.previous_position + (self.transform.position - self.previous_position) * alpha
+
+    @property
+    def interpolated_angle(self) -> float:
+        if self.previous_position is None:
+            return self.transform.angle
+        alpha = self.game.interpolation_alpha
+        return self.previous_angle + (self.transform.angle - self.previous_angle) * alpha
 
     def _integrate(self, delta_time: float):
+        transform = self.transform
+        if self.previous_position is None:
+            self.previous_position = transform.position
+        else:
+            self.previous_position.set(transform.x, transform.y)
+        self.previous_angle = transform.angle
+
         if self.is_kinematic:
             return
 
+        # Scalar and in place math, this runs for every body every step
+        force = self._force_accumulator
         if self.use_gravity:
-            self.add_force(Rigidbody.Gravity * self.mass * self.gravity_scale)
+            gravity = self.mass * self.gravity_scale
+            force.x += Rigidbody.Gravity.x * gravity
+            force.y += Rigidbody.Gravity.y * gravity
 
-        acceleration = self._force_accumulator * self.inv_mass
-        self.velocity += acceleration * delta_time
-        self.velocity *= max(0, 1.0 - self.drag * delta_time)
-        self.transform.position += self.velocity * delta_time
+        velocity = self.velocity
+        velocity.x += force.x * self.inv_mass * delta_time
+        velocity.y += force.y * self.inv_mass * delta_time
+        velocity *= max(0, 1.0 - self.drag * delta_time)
+        transform.x += velocity.x * delta_time
+        transform.y += velocity.y * delta_time
 
         self.angular_velocity += self._torque_accumulator * delta_time
         self.angular_velocity *= max(0, 1.0 - self.angular_drag * delta_time)
-        self.transform.angle += self.angular_velocity * delta_time
+        transform.angle += self.angular_velocity * delta_time
 
-        self._force_accumulator = Vec2(0, 0)
+        force.set(0, 0)
         self._torque_accumulator = 0.0
 
     @staticmethod
@@ -126,23 +166,43 @@ class Rigidbody(Component):
                     Rigidbody._resolve_collision(rb1, rb2, mtv)
 
     @staticmethod
-    def start_physics():
+    def start_physics() -> TimerHandle | None:
         """
         This method should be called at the start of your level to initialize the physics system.
         It will ensure that all rigidbodies are updated and collisions are resolved.
+        If the game has a `fixed_update_rate` the step runs in `Game.fixed_updates` and None is returned,
+        otherwise it runs in a scheduler generator (about 60 Hz, variable step) and its handle is returned.
+        Calling it again while the physics loop is running restarts it instead of adding a second one.
+        Use `Rigidbody.stop_physics` to stop it.
         """
+        Rigidbody.stop_physics()
+
+        game = Game.instance()
+        if game.fixed_delta_time is not None:
+            game.fixed_updates.append(Rigidbody.physics_step)
+            return None
+
         def physics_loop():
-            last_time: float = Game.instance().time
+            last_time: float = game.time
             yield
             while True:
-                current_time: float = Game.instance().time
+                current_time: float = game.time
                 delta = (current_time - last_time) / 1000.0
                 Rigidbody.physics_step(delta if delta < 0.02 else 0.02)  # Cap delta time to avoid large jumps
                 last_time = current_time
                 yield  1 / 60
 
-        Game.instance().scheduler.add_generator(physics_loop(), 0)
+        Rigidbody.physics_handle = game.scheduler.add_generator(physics_loop(), 0)
+        return Rigidbody.physics_handle
 
+    @staticmethod
+    def stop_physics():
+        game = Game.instance()
+        if Rigidbody.physics_step in game.fixed_updates:
+            game.fixed_updates.remove(Rigidbody.physics_step)
+        if Rigidbody.physics_handle is not None:
+            Rigidbody.physics_handle.cancel()
+            Rigidbody.physics_handle = None
 
     @staticmethod
     def _resolve_collision(rb1: Rigidbody, rb2: Rigidbody, mtv: Vec2):
@@ -1,19 +1,16 @@
 from .Collider import Collider, Polygon
-from ..Components.Component import Transform
 from ..Components.TileMap import TileMap
 
 
 class TileMapCollider(Collider):
     def __init__(self, solids: set[int], tile_size: int, mask: int = 1, debug: bool = False):
-        self.word_position = Transform()
         self.mask = mask
         self.solids = solids
         self.tile_size = tile_size
         self.debug = debug
-        Collider.colliders.append(self)
 
     def init(self):
-        self.word_position = self.CalculateGlobalTransform()
+        super().init()
         polygons = []
         tile_map = self.GetComponent(TileMap)
         matrix: list[list[int]] = tile_map.matrix
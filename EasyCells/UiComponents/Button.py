@@ -11,6 +11,16 @@ pg.font.init()
 
 
 class Button(UiComponent):
+    # Loaded fonts by (file, size), loading one reads and parses the file
+    fonts: dict[tuple[str | None, int], pg.font.Font] = {}
+
+    @staticmethod
+    def get_font(font: str | None, font_size: int) -> pg.font.Font:
+        key = (font, font_size)
+        if key not in Button.fonts:
+            Button.fonts[key] = pg.font.Font(f"Assets/{font}", font_size) if font is not None else pg.font.Font(None, font_size)
+        return Button.fonts[key]
+
     def __init__(
             self,
             position: Vec2[float],
@@ -27,7 +37,7 @@ class Button(UiComponent):
     ):
         self.is_clicked = False
 
-        font = pg.font.Font(f"Assets/{font}", font_size) if font is not None else pg.font.Font(None, font_size)
+        font = Button.get_font(font, font_size)
         text_surface = font.render(text, True, font_color)
 
         self.base_image = panel_maker(
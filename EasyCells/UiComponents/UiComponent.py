@@ -3,7 +3,6 @@ from enum import Enum
 
 from ..Components import Camera
 from ..Components.Camera import Drawable
-from ..Components.Component import Transform
 from ..Geometry import Vec2
 
 
@@ -73,7 +72,6 @@ class UiComponent(Drawable):
     def __init__(self, position: Vec2[float], image: pg.Surface, z: int = -101,
                  alignment: UiAlignment = UiAlignment.TOP_LEFT):
         super().__init__()
-        self.word_position = Transform()
         self.image = image
         self.position = position
         self.z = z
@@ -130,10 +128,6 @@ class UiComponent(Drawable):
             )
         )
 
-    def loop(self):
-        self.word_position = Transform.Global
-
-
     def is_mouse_over(self) -> bool:
         if self.draw_on_screen_space:
             position = self.calculate_screen_offset() + self.transform.position
@@ -146,6 +140,6 @@ class UiComponent(Drawable):
         else:
             mouse = Camera.get_global_mouse_position()
             size = Vec2(*self.image.get_size()) * self.transform.scale
-            top_left = Transform.Global.position - Vec2(size.x // 2, size.y // 2)
+            top_left = self.word_position.position - Vec2(size.x // 2, size.y // 2)
 
             return pg.Rect(top_left.to_tuple, size.to_tuple).collidepoint(mouse.to_tuple)
@@ -1,7 +1,8 @@
 from .Geometry import Vec2
 from .NewGame import NewGame
 from .Game import Game
-from .scheduler import Scheduler, Tick
+from .scheduler import Scheduler, Tick, TimerHandle
+from .profiler import Profiler, ProfilerOverlay
 # import Components
 # import UiComponents
 # import PhysicsComponents
@@ -12,6 +13,9 @@ __all__ = [
     "NewGame",
     "Scheduler",
     "Tick",
+    "TimerHandle",
+    "Profiler",
+    "ProfilerOverlay",
     "Components",
     "UiComponents",
     "PhysicsComponents",
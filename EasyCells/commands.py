@@ -0,0 +1,41 @@
+import traceback
+from typing import Callable
+
+from .NewGame import NewGame
+
+
+class CommandBuffer:
+    """
+    Structural changes requested while the game is updating (`Game.deferring`) are queued here and applied
+    together at the end of the frame by `flush`, so the item tree never changes while it's being iterated:
+        `Game.CreateItem` / `Item.CreateChild`: the item is usable right away, but only joins the tree on flush
+        `Item.Destroy` and `Component.Destroy`: applied on flush, the item keeps updating until then
+        `Item.AddComponent` on an item already in the tree: the component is added on flush
+    """
+
+    def __init__(self):
+        self._commands: list[tuple[Callable, tuple]] = []
+
+    def defer(self, function: Callable, *args):
+        self._commands.append((function, args))
+
+    def flush(self):
+        """
+        Applies the queued commands in the order they were queued.
+        """
+        while self._commands:
+            commands, self._commands = self._commands, []
+            for function, args in commands:
+                try:
+                    function(*args)
+                except (KeyboardInterrupt, SystemExit, NewGame) as e:
+                    raise e
+                except Exception as e:
+                    print(f"Error in {function}:\n    {e}")
+                    traceback.print_exc()
+
+    def clear(self):
+        self._commands.clear()
+
+    def __len__(self):
+        return len(self._commands)
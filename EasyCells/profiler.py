@@ -0,0 +1,107 @@
+from collections import deque
+from contextlib import contextmanager
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+import pygame as pg
+
+if TYPE_CHECKING:
+    from .Game import Game
+
+
+class Profiler:
+    """
+    Records where each frame goes into a ring buffer of the last `size` frames.
+    Enable it with `Game.enable_profiler`, while `Game.profiler` is None the hot paths only pay a None check.
+
+    Sections recorded by the engine (seconds per frame):
+        "frame": whole frame, from the start of one frame to the start of the next
+        "loop:<Component class>": `loop` of all components of that class, children not included
+        "loop_batch:<Component class>": `loop_batch` of a batched component class
+        "draw:<Drawable class>": `draw` of all drawables of that class
+        "scheduler": `Scheduler.update`, all callbacks of the frame
+        "network": `NetworkManager.loop`, reading and processing packets
+
+    Camera `loop` includes the draws. Use `Profiler.section` to time your own code.
+    """
+
+    def __init__(self, size: int = 300):
+        self.frames: deque[dict[str, float]] = deque(maxlen=size)
+        self.current: dict[str, float] = {}
+        self.show_overlay = True
+        self._frame_start = perf_counter()
+
+    def add(self, name: str, seconds: float):
+        self.current[name] = self.current.get(name, 0.0) + seconds
+
+    @contextmanager
+    def section(self, name: str):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, perf_counter() - start)
+
+    def end_frame(self):
+        now = perf_counter()
+        self.current["frame"] = now - self._frame_start
+        self.frames.append(self.current)
+        self.current = {}
+        self._frame_start = now
+
+    def clear(self):
+        self.frames.clear()
+        self.current = {}
+
+    def average(self, last: int | None = None) -> dict[str, float]:
+        """
+        Mean milliseconds per frame of each section over the `last` frames (all the buffer if None).
+        Sections missing in a frame count as 0 in it.
+        """
+        frames = list(self.frames)[-last:] if last else self.frames
+        if not frames:
+            return {}
+
+        totals: dict[str, float] = {}
+        for frame in frames:
+            for name, seconds in frame.items():
+                totals[name] = totals.get(name, 0.0) + seconds
+
+        return {name: total * 1000.0 / len(frames) for name, total in totals.items()}
+
+    def report(self, count: int = 10, last: int | None = None) -> list[tuple[str, float]]:
+        """
+        The `count` most expensive sections, (name, ms per frame), most expensive first.
+        """
+        average = self.average(last)
+        average.pop("frame", None)
+        return sorted(average.items(), key=lambda item: -item[1])[:count]
+
+
+class ProfilerOverlay:
+    """
+    Draws the FPS and, if the game has a profiler, its most expensive sections on top of the screen.
+    """
+    font: pg.font.Font | None = None
+
+    def __init__(self, lines: int = 8, average_frames: int = 60, color: tuple[int, int, int] = (255, 255, 0)):
+        self.lines = lines
+        self.average_frames = average_frames
+        self.color = color
+
+    def draw(self, game: 'Game'):
+        if ProfilerOverlay.font is None:
+            ProfilerOverlay.font = pg.font.Font(None, 18)
+
+        texts = [f"FPS: {game.clock.get_fps():.0f}"]
+        profiler = game.profiler
+        if profiler is not None and profiler.show_overlay:
+            average = profiler.average(self.average_frames)
+            texts.append(f"frame: {average.get('frame', 0.0):.2f} ms")
+            texts.extend(f"{name}: {ms:.2f} ms" for name, ms in profiler.report(self.lines, self.average_frames))
+
+        y = 4
+        for text in texts:
+            surface = ProfilerOverlay.font.render(text, True, self.color)
+            game.screen.blit(surface, (4, y))
+            y += surface.get_height()
@@ -1,3 +1,4 @@
+import heapq
 import traceback
 from typing import Generator, Callable
 
@@ -5,158 +6,415 @@ from .NewGame import NewGame
 from .Game import Game
 
 
+class TimerHandle:
+    """
+    A scheduled function or generator, returned by every `Scheduler.add*` call.
+    Queues store (due, seq, handle) tuples and a tuple is only valid while its seq matches the handle,
+    so cancelling or rescheduling never has to search the queue.
+    seq is None when the handle is not scheduled and 0 while it is being run by `Scheduler.update`.
+    """
+    __slots__ = ("scheduler", "due", "seq", "function", "generator", "key", "strict")
+
+    def __init__(self, scheduler: 'Scheduler', function: Callable | None, generator: Generator | None, key,
+                 strict: bool):
+        self.scheduler = scheduler
+        self.due = 0.0
+        self.seq: int | None = None
+        self.function = function
+        self.generator = generator
+        self.key = key
+        # Functions run when due < run_time, generators when due <= run_time
+        self.strict = strict
+
+    @property
+    def active(self) -> bool:
+        return self.seq is not None
+
+    def cancel(self):
+        if self.seq is not None:
+            self.scheduler._forget(self)
+            self.scheduler._queue.cancel(self)
+
+    def reschedule(self, time: float):
+        """
+        Runs the function or resumes the generator `time` seconds from now,
+        also works after the handle fired or was cancelled.
+        """
+        if self.seq is None:
+            self.scheduler._remember(self)
+        self.scheduler._queue.push(self, self.scheduler.game.run_time + time)
+
+
+class HeapTimerQueue:
+    """
+    Min-heap of (due, seq, handle) tuples.
+    Insert and reschedule are O(log n), cancel is O(1) and stale tuples are dropped when popped.
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[float, int, TimerHandle]] = []
+        self._seq = 0
+        self._stale = 0
+
+    def __len__(self):
+        return len(self._heap) - self._stale
+
+    def push(self, handle: TimerHandle, due: float):
+        if handle.seq:
+            self._stale += 1
+        self._seq += 1
+        handle.due = due
+        handle.seq = self._seq
+        heapq.heappush(self._heap, (due, self._seq, handle))
+
+    def cancel(self, handle: TimerHandle):
+        queued = bool(handle.seq)
+        handle.seq = None
+        if queued:
+            self._stale += 1
+            if self._stale > 64 and self._stale * 2 > len(self._heap):
+                self._heap = [item for item in self._heap if item[2].seq == item[1]]
+                heapq.heapify(self._heap)
+                self._stale = 0
+
+    def pop_due(self, now: float) -> list[TimerHandle]:
+        heap = self._heap
+        due: list[TimerHandle] = []
+        deferred: list[tuple[float, int, TimerHandle]] = []
+        while heap and heap[0][0] <= now:
+            item = heapq.heappop(heap)
+            handle = item[2]
+            if handle.seq != item[1]:
+                self._stale -= 1
+                continue
+            if handle.strict and item[0] == now:
+                deferred.append(item)
+                continue
+            handle.seq = 0
+            due.append(handle)
+
+        for item in deferred:
+            heapq.heappush(heap, item)
+
+        return due
+
+    def entries(self) -> list[TimerHandle]:
+        return [item[2] for item in self._heap if item[2].seq == item[1]]
+
+    def clear(self):
+        self._heap.clear()
+        self._stale = 0
+
+
+class TimingWheelTimerQueue:
+    """
+    Hierarchical timing wheel.
+    Time is cut into ticks of `resolution` seconds; every level has `slots` buckets and each level covers
+    `slots` times the range of the level below it. Insert and cancel are O(1), `pop_due` only drains the
+    buckets of the ticks that elapsed since the last call and timers far in the future are cascaded down
+    a level at a time as the wheel turns.
+    """
+
+    def __init__(self, resolution: float = 1 / 120, slots: int = 256, levels: int = 4):
+        if slots & (slots - 1):
+            raise ValueError("slots must be a power of two")
+        self.resolution = resolution
+        self._bits = slots.bit_length() - 1
+        self._mask = slots - 1
+        self._wheels: list[list[list[tuple[float, int, TimerHandle]]]] = [
+            [[] for _ in range(slots)] for _ in range(levels)
+        ]
+        self._overflow: list[tuple[float, int, TimerHandle]] = []
+        self._current = 0  # first tick that has not been fully drained
+        self._seq = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def push(self, handle: TimerHandle, due: float):
+        if not handle.seq:
+            self._count += 1
+        self._seq += 1
+        handle.due = due
+        handle.seq = self._seq
+        self._place((due, self._seq, handle))
+
+    def cancel(self, handle: TimerHandle):
+        if handle.seq:
+            self._count -= 1
+        handle.seq = None
+
+    def _place(self, item: tuple[float, int, 'TimerHandle']):
+        tick = max(int(item[0] / self.resolution), self._current)
+        current = self._current
+        bits = self._bits
+        for level, wheel in enumerate(self._wheels):
+            shift = bits * (level + 1)
+            if tick >> shift == current >> shift:
+                wheel[(tick >> (bits * level)) & self._mask].append(item)
+                return
+        self._overflow.append(item)
+
+    def _cascade(self):
+        # Called when the level 0 wheel wrapped: pull down every higher level bucket that just came into range
+        current = self._current
+        bits = self._bits
+        top = 1
+        while top < len(self._wheels) and current & ((1 << (bits * (top + 1))) - 1) == 0:
+            top += 1
+
+        if top == len(self._wheels):
+            overflow, self._overflow = self._overflow, []
+            for item in overflow:
+                if item[2].seq == item[1]:
+                    self._place(item)
+
+        for level in range(min(top, len(self._wheels) - 1), 0, -1):
+            index = (current >> (bits * level)) & self._mask
+            bucket = self._wheels[level][index]
+            self._wheels[level][index] = []
+            for item in bucket:
+                if item[2].seq == item[1]:
+                    self._place(item)
+
+    def pop_due(self, now: float) -> list[TimerHandle]:
+        fired: list[tuple[float, int, TimerHandle]] = []
+        target = int(now / self.resolution)
+        wheel = self._wheels[0]
+        mask = self._mask
+
+        if self._count == 0 and target > self._current:
+            # Nothing is pending, anything left in the buckets is stale
+            self._current = target
+
+        # Every tick before target is entirely in the past
+        while self._current < target:
+            bucket = wheel[self._current & mask]
+            if bucket:
+                fired.extend(item for item in bucket if item[2].seq == item[1])
+                bucket.clear()
+            self._current += 1
+            if self._current & mask == 0:
+                self._cascade()
+
+        # The current tick is only partially elapsed
+        bucket = wheel[self._current & mask]
+        if bucket:
+            keep = []
+            for item in bucket:
+                handle = item[2]
+                if handle.seq != item[1]:
+                    continue
+                if item[0] < now or (item[0] == now and not handle.strict):
+                    fired.append(item)
+                else:
+                    keep.append(item)
+            wheel[self._current & mask] = keep
+
+        fired.sort(key=lambda item: (item[0], item[1]))
+        due: list[TimerHandle] = []
+        for item in fired:
+            handle = item[2]
+            if handle.seq == item[1]:
+                handle.seq = 0
+                self._count -= 1
+                due.append(handle)
+        return due
+
+    def entries(self) -> list[TimerHandle]:
+        buckets = [bucket for wheel in self._wheels for bucket in wheel] + [self._overflow]
+        return [item[2] for bucket in buckets for item in bucket if item[2].seq == item[1]]
+
+    def clear(self):
+        for wheel in self._wheels:
+            for bucket in wheel:
+                bucket.clear()
+        self._overflow.clear()
+        self._current = 0
+        self._count = 0
+
+
 class Scheduler:
     instance: 'Scheduler' = None
 
-    def __init__(self, game: Game):
-        self.game = game
+    backends: dict[str, type] = {
+        "heap": HeapTimerQueue,
+        "wheel": TimingWheelTimerQueue,
+    }
 
-        self._generators: list[Generator] = []
-        self._generators_times: list[float] = []
-        self._generators_dict: dict[any, Generator] = {}
-        self._generators_dict_times: dict[any, float] = {}
+    def __init__(self, game: Game, backend: str = "heap"):
+        """
+        backend["heap": binary heap, good general default | "wheel": timing wheel, O(1) insert/cancel
+        for very large numbers of short timers]
+        """
+        self.game = game
 
-        self._times: list[float] = []
-        self._functions: list[Callable] = []
+        self._queue: HeapTimerQueue | TimingWheelTimerQueue = Scheduler.backends[backend]()
+        self._running: list[TimerHandle] = []
 
-        self._times_dict: dict[any, float] = {}
-        self._functions_dict: dict[any, Callable] = {}
+        self._functions: dict[Callable, dict[TimerHandle, None]] = {}
+        self._functions_dict: dict[any, TimerHandle] = {}
+        self._generators: dict[Generator, TimerHandle] = {}
+        self._generators_dict: dict[any, TimerHandle] = {}
 
         if not Scheduler.instance:
             Scheduler.instance = self
 
+    def __len__(self):
+        return len(self._queue)
+
+    def _schedule(self, handle: TimerHandle, time: float) -> TimerHandle:
+        self._remember(handle)
+        self._queue.push(handle, self.game.run_time + time)
+        return handle
+
+    def _remember(self, handle: TimerHandle):
+        if handle.generator is None:
+            if handle.key is not None:
+                old = self._functions_dict.get(handle.key)
+                if old is not None and old is not handle:
+                    self._queue.cancel(old)
+                self._functions_dict[handle.key] = handle
+            else:
+                self._functions.setdefault(handle.function, {})[handle] = None
+        else:
+            if handle.key is not None:
+                old = self._generators_dict.get(handle.key)
+                if old is not None and old is not handle:
+                    self._queue.cancel(old)
+                self._generators_dict[handle.key] = handle
+            else:
+                old = self._generators.get(handle.generator)
+                if old is not None and old is not handle:
+                    self._queue.cancel(old)
+                self._generators[handle.generator] = handle
+
+    def _forget(self, handle: TimerHandle):
+        if handle.generator is None:
+            if handle.key is not None:
+                if self._functions_dict.get(handle.key) is handle:
+                    self._functions_dict.pop(handle.key)
+            else:
+                handles = self._functions.get(handle.function)
+                if handles is not None and handle in handles:
+                    del handles[handle]
+                    if not handles:
+                        self._functions.pop(handle.function)
+        else:
+            if handle.key is not None:
+                if self._generators_dict.get(handle.key) is handle:
+                    self._generators_dict.pop(handle.key)
+            elif self._generators.get(handle.generator) is handle:
+                self._generators.pop(handle.generator)
+
+    def _function_handle(self, function: Callable) -> TimerHandle:
+        # Unknown functions and generators raise ValueError, like list.index did before handles
+        handles = self._functions.get(function)
+        if not handles:
+            raise ValueError(f"{function} is not scheduled")
+        return next(iter(handles))
+
+    def _generator_handle(self, generator: Generator) -> TimerHandle:
+        handle = self._generators.get(generator)
+        if handle is None:
+            raise ValueError(f"{generator} is not scheduled")
+        return handle
+
     def update(self):
-        # functions
-        for index, function in enumerate(self._functions):
-            if self._times[index] < self.game.run_time:
-                try:
-                    function()
-                except (KeyboardInterrupt, SystemExit, NewGame) as e:
-                    raise e
-                except Exception as e:
-                    print(f"Error in {function}:\n    {e}")
-                    traceback.print_exc()
-                try:
-                    self._times.pop(index)
-                    self._functions.pop(index)
-                except IndexError:
-                    pass
+        self._running = self._queue.pop_due(self.game.run_time)
+        for handle in self._running:
+            # An earlier callback of this frame may have removed or rescheduled it
+            if handle.seq != 0:
+                continue
 
-        for key in list(self._times_dict.keys()):
-            if self._times_dict[key] < self.game.run_time:
+            if handle.generator is None:
+                handle.seq = None
+                self._forget(handle)
                 try:
-                    self._functions_dict[key]()
+                    handle.function()
                 except (KeyboardInterrupt, SystemExit, NewGame) as e:
                     raise e
                 except Exception as e:
-                    print(f"Error in {self._functions_dict[key]}:\n    {e}")
+                    print(f"Error in {handle.function}:\n    {e}")
                     traceback.print_exc()
-                try:
-                    self._times_dict.pop(key)
-                    self._functions_dict.pop(key)
-                except KeyError:
-                    pass
-
-        # generators
-        for index, generator in enumerate(self._generators):
-            if self._generators_times[index] > self.game.run_time:
                 continue
-            try:
-                next_time = next(generator)
-                if next_time:
-                    self._generators_times[index] = self.game.run_time + next_time
-            except StopIteration:
-                self._generators.remove(generator)
-                self._generators_times.pop(index)
-            except (KeyboardInterrupt, SystemExit, NewGame) as e:
-                raise e
-            except Exception as e:
-                print(f"Error in {generator}:\n    {e}")
-                traceback.print_exc()
 
-        for key in list(self._generators_dict.keys()):
-            generator = self._generators_dict[key]
-            if self._generators_dict_times[key] > self.game.run_time:
-                continue
             try:
-                next_time = next(generator)
+                next_time = next(handle.generator)
+                if handle.seq is None:
+                    continue
                 if next_time:
-                    self._generators_dict_times[key] = self.game.run_time + next_time
+                    self._queue.push(handle, self.game.run_time + next_time)
+                elif handle.seq == 0:
+                    self._queue.push(handle, handle.due)
             except StopIteration:
-                self._generators_dict.pop(key)
-                self._generators_dict_times.pop(key)
+                handle.seq = None
+                self._forget(handle)
             except (KeyboardInterrupt, SystemExit, NewGame) as e:
                 raise e
             except Exception as e:
-                print(f"Error in {generator}:\n    {e}")
+                print(f"Error in {handle.generator}:\n    {e}")
                 traceback.print_exc()
+                if handle.seq == 0:
+                    self._queue.push(handle, handle.due)
+        self._running = []
 
-    def add(self, time: float, function: Callable):
-        self._times.append(self.game.run_time + time)
-        self._functions.append(function)
+    def add(self, time: float, function: Callable) -> TimerHandle:
+        return self._schedule(TimerHandle(self, function, None, None, True), time)
 
     def remove(self, function: Callable):
-        index = self._functions.index(function)
-        self._times.pop(index)
-        self._functions.pop(index)
+        self._function_handle(function).cancel()
 
-    def add_dict(self, key, time: float, function: Callable):
-        self._times_dict[key] = self.game.run_time + time
-        self._functions_dict[key] = function
+    def add_dict(self, key, time: float, function: Callable) -> TimerHandle:
+        return self._schedule(TimerHandle(self, function, None, key, True), time)
 
     def remove_dict(self, key):
-        self._times_dict.pop(key)
-        self._functions_dict.pop(key)
+        self._functions_dict[key].cancel()
 
-    def add_generator(self, generator: Generator, time: float = 0):
-        self._generators.append(generator)
-        self._generators_times.append(self.game.run_time + time)
+    def add_generator(self, generator: Generator, time: float = 0) -> TimerHandle:
+        return self._schedule(TimerHandle(self, None, generator, None, False), time)
 
     def remove_generator(self, generator: Generator):
-        index = self._generators.index(generator)
-        self._generators.pop(index)
-        self._generators_times.pop(index)
+        self._generator_handle(generator).cancel()
 
-    def add_dict_generator(self, key, generator: Generator, time: float = 0):
-        self._generators_dict[key] = generator
-        self._generators_dict_times[key] = self.game.run_time + time
+    def add_dict_generator(self, key, generator: Generator, time: float = 0) -> TimerHandle:
+        return self._schedule(TimerHandle(self, None, generator, key, False), time)
 
     def remove_dict_generator(self, key):
-        try:
-            self._generators_dict.pop(key)
-            self._generators_dict_times.pop(key)
-        except KeyError:
-            return KeyError
+        handle = self._generators_dict.get(key)
+        if handle is not None:
+            handle.cancel()
 
     def change_time_dict_generator(self, key, time: float):
-        self._generators_dict_times[key] = self.game.run_time + time
+        self._generators_dict[key].reschedule(time)
 
     def change_time_generator(self, generator: Generator, time: float):
-        index = self._generators.index(generator)
-        self._generators_times[index] = self.game.run_time + time
+        self._generator_handle(generator).reschedule(time)
 
     def change_time_dict(self, key, time: float):
-        self._times_dict[key] = self.game.run_time + time
+        self._functions_dict[key].reschedule(time)
 
     def change_time(self, function: Callable, time: float):
-        index = self._functions.index(function)
-        self._times[index] = self.game.run_time + time
+        self._function_handle(function).reschedule(time)
 
     def clear(self):
-        self._times.clear()
+        for handle in self._queue.entries():
+            handle.seq = None
+        for handle in self._running:
+            handle.seq = None
+        self._queue.clear()
         self._functions.clear()
-        self._times_dict.clear()
         self._functions_dict.clear()
         self._generators.clear()
-        self._generators_times.clear()
         self._generators_dict.clear()
-        self._generators_dict_times.clear()
 
 
 class Tick:
     def __init__(self, time: float):
         self.time = time
         self.on = True
+        self._handle: TimerHandle | None = None
 
     def turn_off(self):
         self.on = False
@@ -164,13 +422,19 @@ class Tick:
     def turn_on(self):
         self.on = True
 
+    def _schedule_turn_on(self):
+        if self._handle is None or self._handle.scheduler is not Scheduler.instance:
+            self._handle = Scheduler.instance.add(self.time, self.turn_on)
+        else:
+            self._handle.reschedule(self.time)
+
     def reset(self):
         self.on = False
-        Scheduler.instance.add(self.time, self.turn_on)
+        self._schedule_turn_on()
 
     def __call__(self) -> bool:
         if self.on:
             self.on = False
-            Scheduler.instance.add(self.time, self.turn_on)
+            self._schedule_turn_on()
             return True
         return False
@@ -1,7 +1,8 @@
+import numpy as np
 import pygame as pg
 
-from EasyCells import Vec2, Game
-from EasyCells.Components import Sprite
+from EasyCells import Vec2, Game, TimerHandle
+from EasyCells.Components import Item, ItemPool, Prefab, Sprite
 from EasyCells.NetworkComponents import Rpc, SendTo, NetworkComponent
 from EasyCells.PhysicsComponents import RectCollider, Collider
 
@@ -9,6 +10,10 @@ pg.mixer.init()
 _shot_sound = pg.mixer.Sound('Assets/Audio/shot.wav')
 class Shot(NetworkComponent):
     shots: set['Shot'] = set()
+    # Shot items are reused, one pool per game instance, built again on each level load
+    # (the prefab sprite keeps the camera of the level it was built on)
+    pools: dict[int, tuple[int, ItemPool]] = {}
+    image: pg.Surface | None = None
 
     def __init__(self, identifier: int, owner: int, direction: Vec2[float], start: Vec2[float], collider: Collider):
         super().__init__(identifier, owner)
@@ -18,35 +23,94 @@ class Shot(NetworkComponent):
         self.collider = collider
 
         self.speed = 600.0
+        self.velocity = direction * self.speed
+        # Destroys (releases) the shot after 5 seconds, rescheduled on every spawn
+        self.timer: TimerHandle | None = None
 
+    def init(self):
         Shot.shots.add(self)
 
-    def init(self):
-        self.transform.position = self.start
-        self.transform.angle = self.direction.to_angle
-        self.game.scheduler.add(5, self.item.Destroy)
+    def on_spawn(self):
+        Shot.shots.add(self)
 
-    def on_destroy(self):
+    def on_release(self):
         Shot.shots.remove(self)
+        if self.timer is not None:
+            self.timer.cancel()
+
+    def on_destroy(self):
+        # Not registered if destroyed before its first frame
+        Shot.shots.discard(self)
+        if self.timer is not None:
+            self.timer.cancel()
         self.on_destroy = lambda: None
 
-    def loop(self):
-        self.transform.position += self.direction * (self.speed * self.game.delta_time)
+    def on_clone(self):
+        self.timer = None
 
-    @Rpc(SendTo.ALL, require_owner=False)
     @staticmethod
-    def Shot_instantiate(identifier: int, owner: int,  direction: Vec2[float], start: Vec2[float]):
-        game = Game.instance()
+    def pool(game: Game) -> ItemPool:
+        loads, pool = Shot.pools.get(game.my_instance, (None, None))
+        if loads != game.level_loads:
+            if pool is not None:
+                # Its items were destroyed with the old level
+                game.pools.remove(pool)
+            # New shots are copies of a prefab, the collider and the sprite are only built once per level
+            prefab = Prefab(game, Shot._build)
+            pool = game.CreatePool(lambda _: prefab.Instantiate(), on_spawn=Shot._spawned)
+            Shot.pools[game.my_instance] = (game.level_loads, pool)
+        return pool
 
-        shot = game.CreateItem()
-
-        coll = shot.AddComponent(RectCollider(pg.Rect(0, 0, 8, 8), debug=False, mask=owner))
+    @staticmethod
+    def _build(shot: Item):
+        if Shot.image is None:
+            Shot.image = pg.Surface((8, 8))
+            Shot.image.fill((255, 255, 255))
 
-        shot.AddComponent(Shot(identifier, owner, direction, start, coll))
-        _shot_sound.play()
+        coll = shot.AddComponent(RectCollider(pg.Rect(0, 0, 8, 8), debug=False))
+        shot.AddComponent(Shot(None, 0, Vec2(1.0, 0.0), Vec2(0.0, 0.0), coll))
+        shot.AddComponent(Sprite(Shot.image))
 
-        img = pg.Surface((8, 8))
-        img.fill((255, 255, 255))
-        shot.AddComponent(Sprite(img))
+    @staticmethod
+    def _spawned(item: Item, identifier: int, owner: int, direction: Vec2[float], start: Vec2[float]):
+        shot = item.GetComponent(Shot)
+        shot.identifier = identifier
+        shot.owner = owner
+        shot.collider.mask = owner
+        shot.direction = direction
+        shot.start = start
+        shot.velocity = direction * shot.speed
+
+        shot.transform.position = start
+        shot.transform.angle = direction.to_angle
+        if shot.timer is None:
+            shot.timer = shot.game.scheduler.add(5, item.Destroy)
+        else:
+            shot.timer.reschedule(5)
+
+    @classmethod
+    def loop_batch(cls, shots: list['Shot']):
+        game = shots[0].game
+        delta_time = game.delta_time
+        store = game.transform_store
+
+        if store is not None:
+            # Move every shot in one NumPy operation over the transform arrays
+            indices = np.fromiter((shot.transform.index for shot in shots), np.int64, len(shots))
+            velocity = np.array([shot.velocity.to_tuple for shot in shots])
+            store.x[indices] += velocity[:, 0] * delta_time
+            store.y[indices] += velocity[:, 1] * delta_time
+            return
+
+        for shot in shots:
+            transform = shot.transform
+            transform.x += shot.velocity.x * delta_time
+            transform.y += shot.velocity.y * delta_time
 
+    @Rpc(SendTo.ALL, require_owner=False)
+    @staticmethod
+    def Shot_instantiate(identifier: int, owner: int,  direction: Vec2[float], start: Vec2[float]):
+        game = Game.instance()
 
+        Shot.pool(game).spawn(identifier, owner, direction, start)
+        _shot_sound.play()
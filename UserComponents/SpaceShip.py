@@ -57,6 +57,18 @@ class SpaceShip(NetworkComponent):  # NetworkComponent Component
 
     spawned_ships: list[tuple[str, str, int, int]] = []
 
+    # Images shared by every ship, drawn on the first spawn
+    _name_base: pg.Surface | None = None
+    _radar_points: dict[bool, pg.Surface] = {}
+
+    @staticmethod
+    def radar_point(is_player: bool) -> pg.Surface:
+        if is_player not in SpaceShip._radar_points:
+            point = pg.Surface((7, 7), pg.SRCALPHA)
+            pg.draw.circle(point, pg.Color("Cyan") if is_player else pg.Color("Red"), (3, 3), 3, 5)
+            SpaceShip._radar_points[is_player] = point
+        return SpaceShip._radar_points[is_player]
+
     def __init__(self, identifier: int, owner: int, collider: Collider, config: SpaceShipConfig):
         super().__init__(identifier, owner)
 
@@ -100,26 +112,19 @@ class SpaceShip(NetworkComponent):  # NetworkComponent Component
         life.AddComponent(Life(ship_comp))
 
         name = ship.CreateChild()
-        base: pg.Surface = pg.Surface((32, 32), pg.SRCALPHA)
+        if SpaceShip._name_base is None:
+            SpaceShip._name_base = pg.Surface((32, 32), pg.SRCALPHA)
         name.AddComponent(Button(
             Vec2(0, 45),
             player_name,
-            base,
+            SpaceShip._name_base,
             font_color=pg.Color("Cyan") if owner == NetworkManager.instance.id else pg.Color("Red"),
             font_size=16,
             alignment=UiAlignment.GAME_SPACE
         ))
 
         ship_radar_point = ship.CreateChild()
-        point = pg.Surface((7, 7), pg.SRCALPHA)
-        pg.draw.circle(
-            point,
-            pg.Color("Red") if owner != NetworkManager.instance.id else pg.Color("Cyan"),
-            (3, 3),
-            3,
-            5
-        )
-        point = ship_radar_point.AddComponent(SimpleSprite(point))
+        point = ship_radar_point.AddComponent(SimpleSprite(SpaceShip.radar_point(owner == NetworkManager.instance.id)))
         point.add_camera(SpaceShip.mini_map_camera)
         point.remove_main_camera()
 
@@ -0,0 +1,53 @@
+"""
+Runs the benchmark suite headless and prints a table, optionally writing the results as JSON.
+
+    python -m benchmarks                    # engine, memory and network
+    python -m benchmarks engine --quick
+    python -m benchmarks --json results.json
+"""
+import argparse
+
+from . import engine_benchmark, memory_benchmark, network_benchmark, scheduler_benchmark
+from .harness import print_result, write_json
+
+SUITES = {
+    "engine": engine_benchmark.run,
+    "memory": memory_benchmark.run,
+    "network": network_benchmark.run,
+}
+
+
+def main(argv: list[str] | None = None) -> list[dict]:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("suites", nargs="*", metavar="suite",
+                        help=f"one of {', '.join([*SUITES, 'scheduler'])}, all but scheduler by default")
+    parser.add_argument("--quick", action="store_true", help="only the smallest size of each benchmark")
+    parser.add_argument("--json", metavar="PATH", help="write the results to PATH")
+    args = parser.parse_args(argv)
+    for suite in args.suites:
+        if suite not in SUITES and suite != "scheduler":
+            parser.error(f"unknown suite {suite!r}")
+
+    results = []
+    for suite in args.suites or SUITES:
+        if suite == "scheduler":
+            # Timer queue comparison, prints its own table
+            results.extend(
+                {"name": "scheduler_backends", **result}
+                for result in scheduler_benchmark.main(sizes=(1_000,) if args.quick else (1_000, 10_000, 100_000))
+            )
+            continue
+
+        for result in SUITES[suite](quick=args.quick):
+            if "ops_per_sec" in result:
+                print_result(result)
+            results.append(result)
+
+    if args.json:
+        write_json(results, args.json)
+    return results
+
+
+if __name__ == "__main__":
+    main()
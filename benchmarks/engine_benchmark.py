@@ -0,0 +1,205 @@
+"""
+Hot paths of the engine in a headless Game.
+
+    python -m benchmarks engine
+"""
+import random
+
+import pygame as pg
+
+from EasyCells import Game, Vec2
+from EasyCells.Components import Camera, Component, Sprite, TileMap
+from EasyCells.Components.TileMap import TileMapRenderer
+from EasyCells.PhysicsComponents import Collider, RectCollider, Rigidbody
+
+from .harness import SCREEN, load_scene, measure
+
+FRAME = 1 / 60
+
+
+class Spin(Component):
+    """Does a little work every loop, like a typical gameplay component."""
+
+    def loop(self):
+        self.transform.angle += 0.01
+
+
+def _square(size: int, color: tuple[int, int, int]) -> pg.Surface:
+    surface = pg.Surface((size, size), pg.SRCALPHA)
+    surface.fill((*color, 255))
+    return surface
+
+
+def _random_position(width: float, height: float) -> Vec2:
+    return Vec2(random.uniform(-width / 2, width / 2), random.uniform(-height / 2, height / 2))
+
+
+def item_update(roots: int, depth: int = 3) -> dict:
+    """`Item.update` of `roots` items, each with a chain of `depth` children."""
+    def setup(game: Game):
+        for _ in range(roots):
+            item = game.CreateItem()
+            item.AddComponent(Spin())
+            for _ in range(depth):
+                item = item.CreateChild()
+                item.transform.position = Vec2(1, 0)
+                item.AddComponent(Spin())
+        return game
+
+    game = load_scene(setup)
+
+    def step():
+        for item in game.item_list:
+            item.update()
+
+    return measure("item_update", step, roots * (depth + 1), roots=roots, depth=depth)
+
+
+def sprite_draw(count: int) -> dict:
+    """`Camera.render` of `count` rotated Sprites inside the view."""
+    def setup(game: Game):
+        camera = game.CreateItem().AddComponent(Camera())
+        image = _square(32, (200, 120, 40))
+        for _ in range(count):
+            item = game.CreateItem()
+            item.transform.position = _random_position(*SCREEN)
+            item.transform.angle = random.uniform(0, 6.28)
+            item.AddComponent(Sprite(image))
+        return camera
+
+    camera = load_scene(setup)
+    return measure("sprite_draw", camera.render, count, count=count)
+
+
+def collision_global(count: int) -> dict:
+    """`Collider.check_collision_global` of every pair of `count` colliders (N x N)."""
+    def setup(game: Game):
+        colliders = []
+        for _ in range(count):
+            item = game.CreateItem()
+            item.transform.position = _random_position(400, 400)
+            colliders.append(item.AddComponent(RectCollider(pg.Rect(0, 0, 16, 16))))
+        # Colliders only join `Collider.colliders` in their `init`, on the first frame
+        return colliders
+
+    colliders = load_scene(setup)
+    assert all(collider in Collider.colliders for collider in colliders)
+
+    def step():
+        for collider in colliders:
+            for other in colliders:
+                collider.check_collision_global(other)
+
+    return measure("collision_global", step, count * count, frames=20, warmup=2, count=count)
+
+
+def rigidbody_step(count: int) -> dict:
+    """`Rigidbody.physics_step` with `count` bodies."""
+    def setup(game: Game):
+        for _ in range(count):
+            item = game.CreateItem()
+            item.transform.position = _random_position(800, 800)
+            item.AddComponent(RectCollider(pg.Rect(0, 0, 16, 16)))
+            body = item.AddComponent(Rigidbody(use_gravity=False))
+            body.velocity = _random_position(100, 100)
+
+    load_scene(setup)
+    return measure("rigidbody_step", lambda: Rigidbody.physics_step(FRAME), count, frames=20, warmup=2,
+                   count=count)
+
+
+def tilemap_draw(size: int) -> dict:
+    """`TileMapRenderer.draw` of a `size` x `size` map of 16 px tiles."""
+    def setup(game: Game):
+        camera = game.CreateItem().AddComponent(Camera())
+        tile_set = pg.Surface((64, 64), pg.SRCALPHA)
+        for index in range(16):
+            tile_set.fill((index * 15, 100, 255 - index * 15, 255), ((index % 4) * 16, (index // 4) * 16, 16, 16))
+
+        item = game.CreateItem()
+        item.AddComponent(TileMap([[random.randrange(16) for _ in range(size)] for _ in range(size)]))
+        renderer = item.AddComponent(TileMapRenderer(tile_set, 16))
+        return camera, renderer
+
+    camera, renderer = load_scene(setup)
+    cam_x = -camera.screen.get_width() / 2
+    cam_y = -camera.screen.get_height() / 2
+    return measure("tilemap_draw", lambda: renderer.draw(cam_x, cam_y, camera.scale, camera), size * size,
+                   frames=20, warmup=2, size=size)
+
+
+def spawn_despawn(count: int) -> dict:
+    """A frame that destroys `count` of 10 000 live items and creates `count` new ones, like shots."""
+    def setup(game: Game):
+        for _ in range(10_000):
+            game.CreateItem().AddComponent(Spin())
+        return game
+
+    game = load_scene(setup)
+
+    def step():
+        game.deferring = True
+        for item in random.sample(game.item_list, count):
+            item.Destroy()
+        for _ in range(count):
+            game.CreateItem().AddComponent(Spin())
+        game.deferring = False
+        game.commands.flush()
+
+    return measure("spawn_despawn", step, count * 2, frames=50, warmup=2, count=count)
+
+
+def scheduler_update(pending: int) -> dict:
+    """`Scheduler.update` with `pending` timers, each fired timer is scheduled again."""
+    def setup(game: Game):
+        return game
+
+    game = load_scene(setup)
+    fired = [0]
+
+    def callback():
+        fired[0] += 1
+
+    for _ in range(pending):
+        game.scheduler.add(random.random() * 5, callback)
+
+    def step():
+        before = fired[0]
+        game.run_time += FRAME
+        game.scheduler.update()
+        for _ in range(fired[0] - before):
+            game.scheduler.add(5, callback)
+
+    return measure("scheduler_update", step, pending, frames=300, pending=pending)
+
+
+SIZES = {
+    "item_update": (100, 1_000, 5_000),
+    "sprite_draw": (100, 1_000),
+    "collision_global": (10, 50, 100),
+    "rigidbody_step": (10, 50, 100),
+    "tilemap_draw": (32, 128),
+    "spawn_despawn": (100, 1_000),
+    "scheduler_update": (1_000, 10_000, 100_000),
+}
+
+QUICK_SIZES = {name: sizes[:1] for name, sizes in SIZES.items()}
+
+BENCHMARKS = {
+    "item_update": item_update,
+    "sprite_draw": sprite_draw,
+    "collision_global": collision_global,
+    "rigidbody_step": rigidbody_step,
+    "tilemap_draw": tilemap_draw,
+    "spawn_despawn": spawn_despawn,
+    "scheduler_update": scheduler_update,
+}
+
+
+def run(quick: bool = False, seed: int = 0) -> list[dict]:
+    results = []
+    for name, benchmark in BENCHMARKS.items():
+        for size in (QUICK_SIZES if quick else SIZES)[name]:
+            random.seed(seed)
+            results.append(benchmark(size))
+    return results
@@ -0,0 +1,106 @@
+"""
+Shared pieces of the benchmark suite: a headless Game, scene loading and the frame timer.
+"""
+import json
+import platform
+import sys
+import time
+from types import ModuleType
+from typing import Callable
+
+from EasyCells import Game
+
+SCREEN = (1280, 720)
+
+_game: Game | None = None
+
+
+def _empty_level() -> ModuleType:
+    level = ModuleType("benchmark_level")
+    level.init = lambda game: None
+    level.loop = lambda game: None
+    return level
+
+
+def get_game() -> Game:
+    """
+    The headless Game shared by every benchmark of the process.
+    """
+    global _game
+    if _game is None:
+        _game = Game(_empty_level(), "benchmark", screen_resolution=SCREEN, headless=True)
+    return _game
+
+
+def load_scene(setup: Callable[[Game], object]) -> object:
+    """
+    Clears the game and builds a scene with `setup(game)`, returns what `setup` returns.
+    Runs one frame so the components are initialized and have their world transforms.
+    """
+    game = get_game()
+    level = _empty_level()
+    result = []
+    level.init = lambda g: result.append(setup(g))
+    game.new_game(level, supress=True)
+    game.run_once()
+    return result[0]
+
+
+def _percentile(ordered: list[float], percent: float) -> float:
+    index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(name: str, step: Callable[[], object], ops: int, frames: int = 200, warmup: int = 10,
+            **params) -> dict:
+    """
+    Times `frames` calls of `step`, each one counted as a frame doing `ops` operations.
+    """
+    for _ in range(warmup):
+        step()
+
+    times = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        step()
+        times.append(time.perf_counter() - start)
+
+    total = sum(times)
+    ordered = sorted(times)
+    return {
+        "name": name,
+        **params,
+        "frames": frames,
+        "ops_per_frame": ops,
+        "ops_per_sec": ops * frames / total if total else float("inf"),
+        "frame_ms": {
+            "mean": total / frames * 1e3,
+            "p50": _percentile(ordered, 50) * 1e3,
+            "p90": _percentile(ordered, 90) * 1e3,
+            "p99": _percentile(ordered, 99) * 1e3,
+            "max": ordered[-1] * 1e3,
+        },
+    }
+
+
+def print_result(result: dict):
+    frame = result["frame_ms"]
+    params = ", ".join(
+        f"{key}={value}" for key, value in result.items()
+        if key not in ("name", "frames", "ops_per_frame", "ops_per_sec", "frame_ms")
+    )
+    print(
+        f"{result['name']:<18}{params:<28}{result['ops_per_sec']:>14.0f} ops/s"
+        f"{frame['p50']:>10.3f}{frame['p90']:>10.3f}{frame['p99']:>10.3f} ms"
+    )
+
+
+def write_json(results: list[dict], path: str):
+    report = {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    with open(path, "w") as file:
+        json.dump(report, file, indent=2)
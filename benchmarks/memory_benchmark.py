@@ -0,0 +1,100 @@
+"""
+Memory per instance and arithmetic throughput of the slotted Vec2, Transform and Item,
+compared with a plain (__dict__) dataclass like the old Vec2.
+
+    python -m benchmarks memory
+"""
+import tracemalloc
+from dataclasses import dataclass
+
+from EasyCells import Vec2
+from EasyCells.Components import Transform
+
+from .harness import get_game, measure
+
+COUNT = 100_000
+
+
+@dataclass
+class DictVec2:
+    """The old Vec2: a dataclass with a __dict__ and allocating operators only."""
+    x: float
+    y: float
+
+    def __add__(self, other):
+        return DictVec2(self.x + other.x, self.y + other.y)
+
+    def __mul__(self, other: float):
+        return DictVec2(self.x * other, self.y * other)
+
+
+def bytes_per_instance(factory, count: int = COUNT) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [factory() for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # The list holding them is not part of the instances
+    list_size = 8 * len(instances)
+    return (after - before - list_size) / count
+
+
+def memory() -> list[dict]:
+    game = get_game()
+
+    def item():
+        return game.CreateItem()
+
+    results = [
+        {"name": "memory", "type": "DictVec2", "bytes": bytes_per_instance(lambda: DictVec2(1.0, 2.0))},
+        {"name": "memory", "type": "Vec2", "bytes": bytes_per_instance(lambda: Vec2(1.0, 2.0))},
+        {"name": "memory", "type": "Transform", "bytes": bytes_per_instance(Transform)},
+        {"name": "memory", "type": "Item", "bytes": bytes_per_instance(item, COUNT // 10)},
+    ]
+    for created in list(game.item_list):
+        created.Destroy()
+    return results
+
+
+def arithmetic() -> list[dict]:
+    """`velocity = velocity + acceleration * dt` with each representation, 1000 updates per frame."""
+    def allocating(vector_type):
+        velocity = vector_type(0.0, 0.0)
+        acceleration = vector_type(0.0, 980.0)
+
+        def step():
+            nonlocal velocity
+            for _ in range(1000):
+                velocity = velocity + acceleration * (1 / 60)
+
+        return step
+
+    def in_place():
+        velocity = Vec2(0.0, 0.0)
+        acceleration = Vec2(0.0, 980.0)
+
+        def step():
+            for _ in range(1000):
+                velocity.x += acceleration.x * (1 / 60)
+                velocity.y += acceleration.y * (1 / 60)
+                velocity *= 0.999
+
+        return step
+
+    return [
+        measure("vec2_arithmetic", allocating(DictVec2), 1000, type="DictVec2"),
+        measure("vec2_arithmetic", allocating(Vec2), 1000, type="Vec2"),
+        measure("vec2_arithmetic", in_place(), 1000, type="Vec2 in place"),
+    ]
+
+
+def print_memory(result: dict):
+    print(f"{result['name']:<18}{'type=' + result['type']:<28}{result['bytes']:>14.1f} bytes")
+
+
+def run(quick: bool = False) -> list[dict]:
+    results = memory()
+    for result in results:
+        print_memory(result)
+    return results + arithmetic()
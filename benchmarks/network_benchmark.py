@@ -0,0 +1,105 @@
+"""
+Packet throughput of the TCP and UDP servers over loopback.
+
+    python -m benchmarks network
+"""
+import socket
+import time
+
+from EasyCells.NetworkTCP import NetworkClientTCP, NetworkServerTCP
+from EasyCells.NetworkUDP import NetworkClientUDP, NetworkServerUDP
+
+from .harness import get_game, measure
+
+HOST = "127.0.0.1"
+TIMEOUT = 5.0
+
+
+def _free_port(kind: int) -> int:
+    with socket.socket(socket.AF_INET, kind) as probe:
+        probe.bind((HOST, 0))
+        return probe.getsockname()[1]
+
+
+def _wait(condition, what: str):
+    deadline = time.perf_counter() + TIMEOUT
+    while not condition():
+        if time.perf_counter() > deadline:
+            raise TimeoutError(f"Timed out waiting for {what}")
+        time.sleep(0.001)
+
+
+def _packet(payload: int) -> tuple:
+    # Same shape as the NetworkManager packets: (op_code, target_id, payload, args)
+    return 1, 1, "x" * payload, (1.0, 2.0)
+
+
+def tcp_throughput(batch: int, payload: int = 32) -> dict:
+    """Client to server packets, every frame sends `batch` packets and reads them all on the server."""
+    get_game()  # The servers schedule their connect callbacks on the game scheduler
+    port = _free_port(socket.SOCK_STREAM)
+    server = NetworkServerTCP(HOST, port)
+    client = NetworkClientTCP(HOST, port)
+    _wait(lambda: client.id is not None and len(server.clients) > 1, "the TCP connection")
+
+    packet = _packet(payload)
+
+    def step():
+        for _ in range(batch):
+            client.send(packet)
+        received = 0
+        deadline = time.perf_counter() + TIMEOUT
+        while received < batch:
+            if server.read(1) is not None:
+                received += 1
+            elif time.perf_counter() > deadline:
+                raise TimeoutError("TCP packets lost")
+
+    try:
+        return measure("tcp_throughput", step, batch, frames=50, batch=batch, payload=payload)
+    finally:
+        client.server_socket.close()
+        server.server_socket.close()
+
+
+def udp_throughput(batch: int, payload: int = 32) -> dict:
+    """Like `tcp_throughput`, packets lost over loopback are counted in "lost"."""
+    get_game()
+    port = _free_port(socket.SOCK_DGRAM)
+    server = NetworkServerUDP(HOST, port)
+    client = NetworkClientUDP(HOST, port)
+    _wait(lambda: client.id is not None, "the UDP handshake")
+
+    packet = _packet(payload)
+    lost = [0]
+
+    def step():
+        for _ in range(batch):
+            client.send(packet)
+        received = 0
+        deadline = time.perf_counter() + 0.5
+        while received < batch and time.perf_counter() < deadline:
+            if server.read(client.id) is not None:
+                received += 1
+        lost[0] += batch - received
+
+    try:
+        result = measure("udp_throughput", step, batch, frames=50, batch=batch, payload=payload)
+    finally:
+        server.running = False
+        client.server_socket.close()
+        server.server_socket.close()
+    result["lost"] = lost[0]
+    return result
+
+
+BATCHES = (10, 100, 1_000)
+QUICK_BATCHES = BATCHES[:1]
+
+
+def run(quick: bool = False) -> list[dict]:
+    results = []
+    for batch in QUICK_BATCHES if quick else BATCHES:
+        results.append(tcp_throughput(batch))
+        results.append(udp_throughput(batch))
+    return results
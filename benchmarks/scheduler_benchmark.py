@@ -0,0 +1,116 @@
+"""
+Compares the Scheduler timer queues with the list based scheduler it replaced.
+
+    python -m benchmarks.scheduler_benchmark
+"""
+import random
+import time
+from typing import Callable
+
+from EasyCells.scheduler import Scheduler
+
+FRAME = 1 / 60
+SIMULATED_SECONDS = 5.0
+
+
+class _Clock:
+    """Stands in for `Game`, the scheduler only reads `run_time`."""
+
+    def __init__(self):
+        self.run_time = 0.0
+
+
+class ListScheduler:
+    """
+    The function part of the list based Scheduler, kept as a reference point.
+    """
+
+    def __init__(self, game: _Clock):
+        self.game = game
+        self._times: list[float] = []
+        self._functions: list[Callable] = []
+
+    def update(self):
+        for index, function in enumerate(self._functions):
+            if self._times[index] < self.game.run_time:
+                function()
+                try:
+                    self._times.pop(index)
+                    self._functions.pop(index)
+                except IndexError:
+                    pass
+
+    def add(self, time: float, function: Callable):
+        self._times.append(self.game.run_time + time)
+        self._functions.append(function)
+
+    def remove(self, function: Callable):
+        index = self._functions.index(function)
+        self._times.pop(index)
+        self._functions.pop(index)
+
+
+def _make_scheduler(name: str, clock: _Clock):
+    if name == "list":
+        return ListScheduler(clock)
+    return Scheduler(clock, name)
+
+
+def run(name: str, pending: int, seed: int = 0) -> dict[str, float]:
+    random.seed(seed)
+    clock = _Clock()
+    scheduler = _make_scheduler(name, clock)
+    fired = [0]
+
+    def callback():
+        fired[0] += 1
+
+    callbacks = [lambda: callback() for _ in range(pending)]
+
+    start = time.perf_counter()
+    for function in callbacks:
+        scheduler.add(random.random() * SIMULATED_SECONDS, function)
+    insert = time.perf_counter() - start
+
+    # Cancel a small sample, linear for the list scheduler
+    to_cancel = random.sample(callbacks, min(pending // 100, 1000))
+    start = time.perf_counter()
+    for function in to_cancel:
+        scheduler.remove(function)
+    cancel = time.perf_counter() - start
+
+    # Keep the queue at a steady size: every frame refill what expired, like Shot despawn timers
+    frames = 0
+    start = time.perf_counter()
+    while clock.run_time < SIMULATED_SECONDS:
+        before = fired[0]
+        scheduler.update()
+        for _ in range(fired[0] - before):
+            scheduler.add(SIMULATED_SECONDS * 2, callback)
+        clock.run_time += FRAME
+        frames += 1
+    update = time.perf_counter() - start
+
+    return {
+        "insert_us": insert / pending * 1e6,
+        "cancel_us": cancel / max(len(to_cancel), 1) * 1e6,
+        "frame_ms": update / frames * 1e3,
+    }
+
+
+def main(sizes: tuple[int, ...] = (1_000, 10_000, 100_000), backends: tuple[str, ...] = ("list", "heap", "wheel")):
+    print(f"{'backend':<8}{'pending':>10}{'insert us':>12}{'cancel us':>12}{'frame ms':>12}")
+    results = []
+    for pending in sizes:
+        for name in backends:
+            result = run(name, pending)
+            results.append({"backend": name, "pending": pending, **result})
+            print(
+                f"{name:<8}{pending:>10}{result['insert_us']:>12.2f}"
+                f"{result['cancel_us']:>12.2f}{result['frame_ms']:>12.3f}"
+            )
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -21,7 +21,7 @@ import Levels.DrawMask as dm
 
 if __name__ == '__main__':
     #GAME = Game(gt, "Spaceship", True, (1280, 720))
-    #GAME = Game(Levels.test_rigidbody, "Spaceship", True, (600, 400))
+    #GAME = Game(Levels.test_rigidbody, "Spaceship", True, (600, 400), fixed_update_rate=120)
     GAME = Game(dm, "DrawMask", True, (1280, 720), )
     GAME.run()
     # asyncio.run(GAME.run_async())
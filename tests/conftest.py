@@ -0,0 +1,29 @@
+import os
+from types import ModuleType
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from EasyCells import Game  # noqa: E402
+
+
+def _empty_level() -> ModuleType:
+    level = ModuleType("test_level")
+    level.init = lambda game: None
+    level.loop = lambda game: None
+    return level
+
+
+@pytest.fixture
+def game() -> Game:
+    """
+    A headless Game with an empty level, current while the test runs.
+    """
+    game = Game(_empty_level(), "test", headless=True)
+    previous_instance = Game.current_instance
+    Game.current_instance = game.my_instance
+    yield game
+    Game.current_instance = previous_instance
+    Game.instances.pop(game.my_instance, None)
@@ -0,0 +1,60 @@
+import pygame as pg
+
+from EasyCells.Components import Animation, Animator, Camera, Sprite
+
+
+def _animator(game) -> Animator:
+    game.CreateItem().AddComponent(Camera())
+    item = game.CreateItem()
+    item.AddComponent(Sprite(pg.Surface((4, 4))))
+    animator = item.AddComponent(Animator({"walk": Animation(1, [0, 1, 2, 3])}, "walk"))
+    game.run_once()
+    return animator
+
+
+def _advance(game, time: float):
+    game.run_time += time
+    game.scheduler.update()
+
+
+def test_restarting_runs_one_animation(game):
+    animator = _animator(game)
+    animation = animator.dict_animations["walk"]
+    running = len(game.scheduler)
+
+    animator.current_animation = None
+    animator.current_animation = "walk"
+    animator.current_animation = None
+    animator.current_animation = "walk"
+    assert len(game.scheduler) == running
+
+    frame = animation.current_frame
+    _advance(game, 0)
+    _advance(game, 1.5)
+    assert animation.current_frame == (frame + 2) % 4
+
+
+def test_animation_started_before_init_runs_once(game):
+    game.CreateItem().AddComponent(Camera())
+    item = game.CreateItem()
+    item.AddComponent(Sprite(pg.Surface((4, 4))))
+    animator = item.AddComponent(Animator({"walk": Animation(1, [0, 1, 2, 3])}, "walk"))
+    animator.current_animation = None
+    animator.current_animation = "walk"
+    game.run_once()
+
+    assert len(game.scheduler) == 1
+    animation = animator.dict_animations["walk"]
+    frame = animation.current_frame
+    _advance(game, 1.5)
+    assert animation.current_frame == (frame + 1) % 4
+
+
+def test_stopped_animation_does_not_advance(game):
+    animator = _animator(game)
+    animation = animator.dict_animations["walk"]
+    animator.current_animation = None
+
+    frame = animation.current_frame
+    _advance(game, 5)
+    assert animation.current_frame == frame
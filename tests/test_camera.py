@@ -0,0 +1,21 @@
+import pytest
+
+from EasyCells.Components.Camera import Camera, Drawable
+
+
+def test_to_draw_is_in_draw_order_and_read_only(game):
+    camera = game.CreateItem().AddComponent(Camera())
+    back = game.CreateItem()
+    back.transform.z = 1
+    back_drawable = back.AddComponent(Drawable())
+    front_drawable = game.CreateItem().AddComponent(Drawable())
+    game.run_once()
+    assert camera.to_draw == (back_drawable, front_drawable)
+
+    with pytest.raises(TypeError, match="add_drawable"):
+        camera.to_draw.append(Drawable())
+    with pytest.raises(TypeError, match="remove_drawable"):
+        camera.to_draw.remove(back_drawable)
+    with pytest.raises(TypeError):
+        camera.to_draw += (Drawable(),)
+    assert camera.to_draw == (back_drawable, front_drawable)
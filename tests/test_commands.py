@@ -0,0 +1,101 @@
+from EasyCells.Components import Component
+
+
+class Hook(Component):
+    """Runs `function(game)` on its first loop."""
+
+    def __init__(self, function):
+        self.function = function
+        self.done = False
+
+    def loop(self):
+        if not self.done:
+            self.done = True
+            self.function(self.game)
+
+
+def _roots_are_consistent(game):
+    for index, item in enumerate(game.item_list):
+        assert item._list_index == index
+        assert item.parent is None
+
+
+def test_add_child_of_item_created_in_the_frame(game):
+    roots = [game.CreateItem() for _ in range(3)]
+    created = []
+
+    def frame(game):
+        item = game.CreateItem()
+        created.append(item)
+        roots[1].AddChild(item)
+
+    roots[0].AddComponent(Hook(frame))
+    game.run_once()
+
+    assert set(game.item_list) == set(roots)
+    _roots_are_consistent(game)
+    assert created[0].parent is roots[1]
+    assert created[0] in roots[1].children
+    assert created[0] not in game.item_list
+
+
+def test_add_child_of_item_created_in_the_frame_with_one_root(game):
+    root = game.CreateItem()
+
+    def frame(game):
+        root.AddChild(game.CreateItem())
+
+    root.AddComponent(Hook(frame))
+    game.run_once()
+
+    assert game.item_list == [root]
+    assert len(root.children) == 1
+
+
+def test_structural_changes_wait_for_the_end_of_the_frame(game):
+    keep = game.CreateItem()
+    doomed = game.CreateItem()
+    doomed_child = doomed.CreateChild()
+    seen = {}
+
+    def frame(game):
+        created = game.CreateItem()
+        child = keep.CreateChild()
+        doomed.Destroy()
+        seen["during"] = (created in game.item_list, child in keep.children, doomed in game.item_list)
+        seen["created"] = created
+
+    keep.AddComponent(Hook(frame))
+    game.run_once()
+
+    assert seen["during"] == (False, False, True)
+    assert seen["created"] in game.item_list
+    assert len(keep.children) == 1
+    assert doomed not in game.item_list
+    assert doomed._destroyed and doomed_child._destroyed
+    assert len(game.commands) == 0
+    _roots_are_consistent(game)
+
+
+def test_created_then_destroyed_in_the_same_frame(game):
+    root = game.CreateItem()
+
+    def frame(game):
+        item = game.CreateItem()
+        item.Destroy()
+
+    root.AddComponent(Hook(frame))
+    game.run_once()
+
+    assert game.item_list == [root]
+    _roots_are_consistent(game)
+
+
+def test_swap_remove_keeps_root_indexes(game):
+    roots = [game.CreateItem() for _ in range(5)]
+    roots[1].Destroy()
+    roots[3].AddChild(roots[4])
+    roots[0].Destroy()
+
+    assert set(game.item_list) == {roots[2], roots[3]}
+    _roots_are_consistent(game)
@@ -0,0 +1,46 @@
+import pygame as pg
+import pytest
+
+from EasyCells.Components.TileMapIsometricRender import TileMap3D, TileMapIsometricRenderer, IsometricChunk
+from EasyCells.Components import Camera, Sprite
+
+
+def _renderer(game, chunk_size: int | None, size: tuple[int, int, int] = (16, 16, 4)) -> TileMapIsometricRenderer:
+    game.CreateItem().AddComponent(Camera())
+    width, height, depth = size
+    tile_set = pg.Surface((32, 32), pg.SRCALPHA)
+    tile_set.fill((255, 0, 0, 255))
+    item = game.CreateItem()
+    item.AddComponent(TileMap3D([[[0] * width for _ in range(height)] for _ in range(depth)]))
+    renderer = item.AddComponent(TileMapIsometricRenderer(tile_set, (32, 32), chunk_size=chunk_size))
+    game.run_once()
+    return renderer
+
+
+def _tile_top(renderer: TileMapIsometricRenderer, x: int, y: int, z: int) -> tuple[float, float]:
+    width, height = renderer.tile_size
+    return (x - y) * width // 2, ((x + y) * height // 4 - z * height // 2) - renderer._hy()
+
+
+@pytest.mark.parametrize("chunk_size", [None, 4])
+def test_depth_bucket_is_the_z_of_the_drawable_under_it(game, chunk_size):
+    renderer = _renderer(game, chunk_size)
+    if chunk_size is None:
+        drawables = {
+            (child.transform.position.x, child.transform.position.y, child.transform.z): child
+            for child in renderer.item.children
+            if child.GetComponent(Sprite)
+        }
+        assert len(drawables) == 16 * 16 * 4
+    width, height, depth = renderer.tile_map.size
+    for z in range(depth):
+        for y in range(height):
+            for x in range(width):
+                top_x, top_y = _tile_top(renderer, x, y, z)
+                bucket = renderer.depth_bucket(top_x, top_y, z)
+                if chunk_size is None:
+                    assert (top_x, top_y, bucket) in drawables, (x, y, z)
+                else:
+                    chunk = renderer.chunks[(z, y // chunk_size, x // chunk_size)]
+                    assert isinstance(chunk, IsometricChunk)
+                    assert bucket == chunk.transform.z, (x, y, z)
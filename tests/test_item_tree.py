@@ -0,0 +1,103 @@
+from EasyCells.Components import Component
+
+
+class Counter(Component):
+    """Counts its loops."""
+
+    def __init__(self):
+        self.loops = 0
+
+    def loop(self):
+        self.loops += 1
+
+
+def test_destroy_subtree_keeps_sibling_looping(game):
+    root = game.CreateItem()
+    a = root.CreateChild()
+    counter = a.AddComponent(Counter())
+    b = root.CreateChild()
+    c = b.CreateChild()
+    c.AddComponent(Counter())
+    game.run_once()
+    assert root._subtree_loopers == 2
+
+    b.Destroy()
+    assert root._subtree_loopers == 1
+    assert a._subtree_loopers == 1
+
+    loops = counter.loops
+    game.run_once()
+    assert counter.loops == loops + 1
+
+
+def test_destroy_nested_subtree_counts(game):
+    root = game.CreateItem()
+    root.AddComponent(Counter())
+    middle = root.CreateChild()
+    middle.AddComponent(Counter())
+    leaf = middle.CreateChild()
+    leaf.AddComponent(Counter())
+    assert root._subtree_loopers == 3
+
+    middle.Destroy()
+    assert root._subtree_loopers == 1
+
+
+def test_add_child_moves_looper_counts(game):
+    first = game.CreateItem()
+    second = game.CreateItem()
+    child = first.CreateChild()
+    child.AddComponent(Counter())
+    assert (first._subtree_loopers, second._subtree_loopers) == (1, 0)
+
+    second.AddChild(child)
+    assert (first._subtree_loopers, second._subtree_loopers) == (1 - 1, 1)
+    assert child.parent is second
+
+    root = game.CreateItem()
+    root.AddChild(second)
+    assert root._subtree_loopers == 1
+    assert second not in game.item_list
+
+
+def test_sleeping_item_wakes_with_a_looper(game):
+    item = game.CreateItem()
+    assert item._subtree_loopers == 0
+    counter = item.CreateChild().AddComponent(Counter())
+    game.run_once()
+    assert item._subtree_loopers == 1
+    assert counter.loops == 1
+
+
+class Batched(Component):
+    """Counts the batches it was in."""
+
+    def __init__(self):
+        self.batches = 0
+
+    @classmethod
+    def loop_batch(cls, components: list['Batched']):
+        for component in components:
+            component.batches += 1
+
+
+def test_inactive_subtree_skips_batched_components(game):
+    root = game.CreateItem()
+    middle = root.CreateChild()
+    batched = middle.CreateChild().AddComponent(Batched())
+    other = game.CreateItem().AddComponent(Batched())
+    game.run_once()
+    assert (batched.batches, other.batches) == (1, 1)
+
+    root.active = False
+    game.run_once()
+    assert (batched.batches, other.batches) == (1, 2)
+
+    root.active = True
+    middle.active = False
+    game.run_once()
+    assert (batched.batches, other.batches) == (1, 3)
+
+    middle.active = True
+    game.run_once()
+    assert (batched.batches, other.batches) == (2, 4)
@@ -0,0 +1,113 @@
+import pytest
+
+from EasyCells.scheduler import Scheduler
+
+
+@pytest.fixture(params=["heap", "wheel"])
+def scheduler(request, game) -> Scheduler:
+    game.run_time = 0
+    return Scheduler(game, request.param)
+
+
+def _advance(scheduler: Scheduler, time: float):
+    scheduler.game.run_time += time
+    scheduler.update()
+
+
+def test_cancelled_handle_does_not_run(scheduler):
+    calls = []
+    handle = scheduler.add(0.5, lambda: calls.append("cancelled"))
+    scheduler.add(0.5, lambda: calls.append("kept"))
+
+    handle.cancel()
+    _advance(scheduler, 1)
+
+    assert calls == ["kept"]
+    assert not handle.active
+    assert len(scheduler) == 0
+
+
+def test_reschedule_delays_the_run(scheduler):
+    calls = []
+    handle = scheduler.add(0.5, lambda: calls.append(scheduler.game.run_time))
+
+    _advance(scheduler, 0.25)
+    handle.reschedule(1)
+    _advance(scheduler, 0.5)
+    assert calls == []
+    _advance(scheduler, 1)
+    assert calls == [1.75]
+
+    # Works again once the handle fired
+    handle.reschedule(0.5)
+    _advance(scheduler, 1)
+    assert calls == [1.75, 2.75]
+
+
+def test_remove_and_change_time_by_function(scheduler):
+    calls = []
+
+    def function():
+        calls.append(scheduler.game.run_time)
+
+    scheduler.add(0.5, function)
+    scheduler.change_time(function, 2)
+    _advance(scheduler, 1)
+    assert calls == []
+    _advance(scheduler, 2)
+    assert calls == [3]
+
+    scheduler.add(0.5, function)
+    scheduler.remove(function)
+    _advance(scheduler, 1)
+    assert calls == [3]
+
+
+def test_generator_cancel_and_reschedule(scheduler):
+    steps = []
+
+    def generator():
+        while True:
+            steps.append(scheduler.game.run_time)
+            yield 1
+
+    running = generator()
+    scheduler.add_generator(running)
+    _advance(scheduler, 0)
+    scheduler.change_time_generator(running, 3)
+    _advance(scheduler, 2)
+    assert steps == [0]
+    _advance(scheduler, 2)
+    assert steps == [0, 4]
+
+    scheduler.remove_generator(running)
+    _advance(scheduler, 5)
+    assert steps == [0, 4]
+
+
+def test_unknown_entries_raise_value_error(scheduler):
+    def function():
+        pass
+
+    def generator():
+        yield 0
+
+    with pytest.raises(ValueError):
+        scheduler.remove(function)
+    with pytest.raises(ValueError):
+        scheduler.change_time(function, 1)
+    with pytest.raises(ValueError):
+        scheduler.remove_generator(generator())
+    with pytest.raises(ValueError):
+        scheduler.change_time_generator(generator(), 1)
+
+
+def test_remove_dict_generator_ignores_unknown_keys(scheduler):
+    def generator():
+        yield 0
+
+    scheduler.add_dict_generator("key", generator(), 1)
+    assert scheduler.remove_dict_generator("missing") is None
+    assert scheduler.remove_dict_generator("key") is None
+    assert scheduler.remove_dict_generator("key") is None
+    assert len(scheduler) == 0
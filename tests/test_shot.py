@@ -0,0 +1,14 @@
+from EasyCells.Components import Camera
+
+
+def test_pool_is_rebuilt_when_the_same_level_is_loaded_again(game):
+    from UserComponents.Shot import Shot
+
+    game.level.init = lambda game: game.CreateItem().AddComponent(Camera())
+    game.new_game(game.level, supress=True)
+    pool = Shot.pool(game)
+    assert Shot.pool(game) is pool
+
+    game.new_game(game.level, supress=True)
+    assert Shot.pool(game) is not pool
+    assert pool not in game.pools
@@ -0,0 +1,38 @@
+import pygame as pg
+
+from EasyCells.Components import Camera, SpriteStacks, SpriteStackModel
+
+
+def _stack(layers: int = 4, size: int = 8) -> pg.Surface:
+    image = pg.Surface((layers * size, size), pg.SRCALPHA)
+    image.fill((255, 0, 0, 255))
+    return image
+
+
+def test_models_are_shared_and_dropped_with_their_last_user(game):
+    game.CreateItem().AddComponent(Camera())
+    image = _stack()
+    first = game.CreateItem().AddComponent(SpriteStacks(image, (8, 8), 10))
+    second = game.CreateItem().AddComponent(SpriteStacks(image, (8, 8), 10))
+    game.run_once()
+
+    assert first.model is second.model
+    assert first.model.users == 2
+    assert first.image is not None and first.model.bytes > 0
+
+    first.item.Destroy()
+    assert SpriteStackModel.models.get(second.model.key) is second.model
+    second.item.Destroy()
+    assert second.model.key not in SpriteStackModel.models
+
+
+def test_warm_renders_views_on_the_game_frames(game):
+    game.CreateItem().AddComponent(Camera())
+    stacks = game.CreateItem().AddComponent(SpriteStacks(_stack(), (8, 8), 30, warm=True))
+    model = stacks.model
+    for _ in range(len(model) // 4 + 2):
+        game.run_once()
+
+    assert None not in model.views
+    stacks.item.Destroy()
+    assert model.key not in SpriteStackModel.models
@@ -0,0 +1,55 @@
+import gc
+
+import pygame as pg
+
+from EasyCells.Components.SurfaceCache import SurfaceCache
+
+
+def _image(size=(8, 8)) -> pg.Surface:
+    image = pg.Surface(size, pg.SRCALPHA)
+    image.fill((255, 0, 0))
+    return image
+
+
+def test_frames_are_dropped_with_their_image():
+    cache = SurfaceCache()
+    kept = _image()
+    cache.get(kept, (0, 0, 8, 8), (16, 16))
+    for _ in range(50):
+        # Images made every frame, like rendered text
+        cache.get(_image(), (0, 0, 8, 8), (16, 16), angle=45)
+    gc.collect()
+
+    assert len(cache) == 1
+    assert cache.bytes == 16 * 16 * 4
+    assert cache.get(kept, (0, 0, 8, 8), (16, 16)) is cache.get(kept, (0, 0, 8, 8), (16, 16))
+
+
+def test_clear_drops_only_the_frames_of_the_image():
+    cache = SurfaceCache()
+    first, second = _image(), _image()
+    cache.get(first, (0, 0, 8, 8), (4, 4))
+    cache.get(second, (0, 0, 8, 8), (4, 4))
+
+    cache.clear(first)
+
+    assert len(cache) == 1
+    assert cache.bytes == 4 * 4 * 4
+    del first
+    gc.collect()
+    assert len(cache) == 1
+
+
+def test_least_recently_used_frames_are_dropped_over_budget():
+    cache = SurfaceCache(max_bytes=2 * 16 * 16 * 4)
+    images = [_image() for _ in range(3)]
+    for image in images:
+        cache.get(image, (0, 0, 8, 8), (16, 16))
+
+    assert len(cache) == 2
+    assert cache.bytes <= cache.max_bytes
+    cache.get(images[1], (0, 0, 8, 8), (16, 16))
+    assert cache.hits == 1
+    del images, image
+    gc.collect()
+    assert len(cache) == 0 and cache.bytes == 0
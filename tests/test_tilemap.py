@@ -0,0 +1,49 @@
+import math
+
+import pygame as pg
+
+from EasyCells.Components import Camera, TileMap
+from EasyCells.Components.TileMap import TileMapRenderer
+
+
+def _renderer(game, size: int = 40) -> TileMapRenderer:
+    game.CreateItem().AddComponent(Camera())
+    tile_set = pg.Surface((32, 16), pg.SRCALPHA)
+    tile_set.fill((255, 0, 0, 255), (0, 0, 16, 16))
+    tile_set.fill((0, 0, 255, 255), (16, 0, 16, 16))
+    item = game.CreateItem()
+    item.AddComponent(TileMap([[0] * size for _ in range(size)]))
+    renderer = item.AddComponent(TileMapRenderer(tile_set, 16, chunk_size=4))
+    game.run_once()
+    return renderer
+
+
+def test_rotated_chunks_leave_no_gaps(game):
+    renderer = _renderer(game)
+    renderer.item.transform.angle = math.radians(30.4)
+    screen = pg.Surface((800, 600), pg.SRCALPHA)
+    camera = Camera.instance()
+    camera._screen = screen
+    renderer.draw(-400, -300, 1, camera)
+
+    # Around the center the map is opaque, a seam would leave a transparent pixel
+    for x in range(300, 500):
+        for y in range(200, 400):
+            assert screen.get_at((x, y)).a == 255, (x, y)
+
+
+def test_set_tile_redraws_only_its_chunk(game):
+    renderer = _renderer(game)
+    screen = pg.Surface((800, 600), pg.SRCALPHA)
+    camera = Camera.instance()
+    camera._screen = screen
+    renderer.draw(-400, -300, 1, camera)
+    chunks = dict(renderer._chunks)
+
+    renderer.tile_map.set_tile(20, 20, 1)
+    assert renderer._chunks == chunks
+    assert chunks[(5, 5)].get_at((0, 0)) == pg.Color(0, 0, 255, 255)
+
+    renderer.tile_map.fill((0, 0), (5, 5), 1)
+    assert (0, 0) not in renderer._chunks and (1, 1) not in renderer._chunks
+    assert (2, 2) in renderer._chunks